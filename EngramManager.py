@@ -11,17 +11,82 @@ LEAN, FAST, FUNCTIONAL:
 Main controller for the spatial memory system.
 """
 
-import os
 import time
-import lmdb
-import pickle
-import json
-import math
-from typing import Dict, List, Optional
-from SpatialValenceToCoordGeneration import SpatialValenceToCoordGeneration
+import numpy as np
+from math import sqrt
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from EnhancedDBManager import EnhancedDBManager
 from SemanticLinking_Manager_V2 import SemanticLinking_Manager_V2
 from EnhancedSpatialValenceProcessor import EnhancedSpatialValenceToCoordGeneration, SemanticDepth
+from SpatialKernels import coords_to_matrix, coords_to_vec, dist9_sq, radial_top_k
+
+# Distinct query texts whose 9D vectors are kept for repeated searches
+QUERY_CACHE_SIZE = 4096
+
+# Bulk batches smaller than this are encoded in-process: pickling shards
+# to worker processes costs more than the analysis itself
+PARALLEL_ENCODE_MIN_TEXTS = 256
+
+# Per-process coordinate system for encode-pool workers
+_worker_coord_system = None
+
+def _init_encode_worker():
+    """Encode-pool initializer: one coordinate system per worker process"""
+    global _worker_coord_system
+    _worker_coord_system = EnhancedSpatialValenceToCoordGeneration(SemanticDepth.DEEP)
+
+def _encode_chunk(texts: List[str]) -> Tuple[List[Dict], Dict[str, int]]:
+    """Encode-pool task: coordinate analysis for one shard, plus the shard's analyzer stat counts"""
+    stats = _worker_coord_system.processor.stats
+    before = dict(stats)
+    results = _worker_coord_system.process_batch(texts)
+    return results, {name: count - before.get(name, 0) for name, count in stats.items()}
+
+def _silent(*args, **kwargs):
+    """No-op stand-in for print when verbose output is disabled"""
+    pass
+
+class Link:
+    """
+    🔗 In-memory semantic link record
+    
+    Slotted so the per-store link objects stay small; flattened to a plain
+    dict (to_dict) only when written to the database.
+    """
+    __slots__ = ('target_memory_id', 'target_coordinate_key', 'target_coordinates',
+                 'summary', 'link_type', 'strength', 'distance')
+    
+    def __init__(self, target_memory_id: int, target_coordinate_key: str, target_coordinates: Dict[str, float],
+                 summary: str, link_type: str, strength: float, distance: float):
+        self.target_memory_id = target_memory_id
+        self.target_coordinate_key = target_coordinate_key
+        self.target_coordinates = target_coordinates
+        self.summary = summary
+        self.link_type = link_type
+        self.strength = strength
+        self.distance = distance
+    
+    def to_dict(self) -> Dict:
+        """Flatten to the stored link dictionary format"""
+        return {
+            'target_memory_id': self.target_memory_id,
+            'target_coordinate_key': self.target_coordinate_key,
+            'target_coordinates': self.target_coordinates,
+            'summary': self.summary,
+            'link_type': self.link_type,
+            'strength': self.strength,
+            'distance': self.distance
+        }
+
+def _links_to_record(embedded_links: Dict) -> Dict:
+    """Flatten an embedded_links structure of Link objects for storage"""
+    return {
+        'succession_links': [link.to_dict() for link in embedded_links['succession_links']],
+        'radial_links': [link.to_dict() for link in embedded_links['radial_links']],
+        'total_links': embedded_links['total_links']
+    }
 
 class EngramManager:
     """
@@ -37,8 +102,20 @@ class EngramManager:
                  db_path="DigitalEngramEdgeV2/CoreData.lmdb",
                  enable_linking=True,
                  turbo_mode=True,
-                 verbose=True):
-        """Initialize the clean Engram Manager"""
+                 verbose=True,
+                 max_size=50 * 1024 * 1024 * 1024,
+                 encode_workers=None):
+        """
+        Initialize the clean Engram Manager
+        
+        max_size: LMDB map size in bytes
+        encode_workers: Processes used to encode bulk batches (default: 1 = in-process).
+            Opt-in: on Linux the pool forks this (possibly multi-threaded)
+            process, and under spawn/forkserver start methods the calling
+            script must guard its entry point with `if __name__ == "__main__":`.
+            Only worth it on multi-core machines with batches of at least
+            PARALLEL_ENCODE_MIN_TEXTS texts.
+        """
         
         if verbose:
             print("🧠" * 30)
@@ -54,7 +131,7 @@ class EngramManager:
         # Initialize database manager
         self.db_manager = EnhancedDBManager(
             db_path=db_path,
-            max_size=50 * 1024 * 1024 * 1024,  # 50GB for massive datasets
+            max_size=max_size,  # Map reserved once at open: 50GB default for massive datasets
             turbo_mode=turbo_mode
         )
         if verbose:
@@ -78,22 +155,40 @@ class EngramManager:
         self.total_stored = 0
         self.total_retrieved = 0
         self.verbose = verbose
+        # Logging hook: print when verbose, no-op otherwise. Per-store messages
+        # that build f-strings stay behind an explicit `if self.verbose` check.
+        self._log = print if verbose else _silent
+        
+        # Query text -> read-only 9D vector; agent loops repeat the same queries
+        self._embed_query = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._compute_query_vec)
+        
+        # Bulk encoding is sharded across processes; commits stay on this thread
+        self.encode_workers = encode_workers or 1
+        self._encode_pool = None
         
         # TURBO MODE: RAM cache for recent memories
-        self.memory_cache = []  # Cache last N memories for fast linking
         self.cache_size = 10   # Keep last 10 memories in RAM (1 succession + 9 spatial candidates)
+        # Fixed-size ring buffer: slot (head % cache_size) is overwritten next
+        self.memory_cache = [None] * self.cache_size  # Cache last N memories for fast linking
+        self._cache_head = 0   # Monotonic insert counter
+        self._cache_count = 0  # Number of filled slots
+        self._cache_by_id = {}  # memory_id -> ring slot
+        # SoA mirror of the cached coordinates: row i belongs to memory_cache[i]
+        self._cache_coords = np.zeros((self.cache_size, 9), dtype=np.float32)
         self.pending_updates = {}  # Batch updates for efficiency
         
+        # Radial linking: filter on squared distance, sqrt only the survivors
+        self.radial_threshold = 0.6
+        self.max_radial_links = 3
+        self._radial_threshold_sq = self.radial_threshold * self.radial_threshold
+        
         # TURBO: Larger batches for MASSIVE databases
         self.batch_size = 500 if turbo_mode else 100  # Bigger batches for huge DBs
         
-        # TURBO LINK TRACKING
-        self.turbo_stats = {
-            'succession_links': 0,
-            'radial_links': 0,
-            'total_links': 0,
-            'memories_with_links': 0
-        }
+        # TURBO LINK TRACKING: plain counters, exposed as a dict via turbo_stats
+        self._ts_succession = 0
+        self._ts_radial = 0
+        self._ts_mem_with_links = 0
         
         if verbose:
             print("\n🎯 ENGRAM MANAGER V2 READY!")
@@ -116,73 +211,276 @@ class EngramManager:
         Returns:
             int: Memory ID if successful, None if failed
         """
+        try:
+            with self.db_manager.env.begin(write=True, buffers=True) as txn:
+                memory_id = self.store_memory_in_txn(txn, text, metadata)
+                self.db_manager._maybe_save_stats(txn)
+            self.db_manager._invalidate_reads()
+            return memory_id
+            
+        except Exception as e:
+            self._log(f"❌ Storage failed: {e}")
+            return None
+    
+    def store_memory_in_txn(self, txn, text: str, metadata: Optional[Dict] = None,
+                            result: Optional[Dict] = None,
+                            coord_vec: Optional[np.ndarray] = None) -> Optional[int]:
+        """
+        Store text inside a caller-owned LMDB write transaction
+        
+        Used by bulk ingest so that the memory put and any backward-link
+        batch updates share one commit. The caller persists DB stats
+        before committing.
+        
+        Args:
+            txn: Open write transaction on self.db_manager.env
+            text: Input text to store
+            metadata: Optional metadata dictionary
+            result: Precomputed coord_system.process(text) output, if any
+            coord_vec: Precomputed float32 (9,) vector of result's coordinates
+            
+        Returns:
+            int: Memory ID if successful, None if the text could not be analyzed
+            
+        Raises:
+            Exception: Any failure once writing has begun (txn must be aborted)
+        """
+        db_manager = self.db_manager
         try:
             # Process text through coordinate system
-            result = self.coord_system.process(text)
+            if result is None:
+                result = self._stored_analysis(text, txn) or self.coord_system.process(text)
+                coord_vec = None
+            if coord_vec is None:
+                coord_vec = coords_to_vec(result['coordinates'])
+            coord_key_bytes = db_manager._create_coordinate_key(result['coordinates'])
+        except Exception as e:
+            self._log(f"❌ Storage failed: {e}")
+            return None
+        
+        # Prepare storage data. Nothing was written above; from here on errors
+        # propagate so the transaction owner aborts instead of committing a
+        # record whose store was reported as failed
+        storage_data = {
+            'input_text': text,
+            'semantic_summary': result['summary'],
+            'coordinates': result['coordinates'],
+            'coordinate_key': result['coordinate_key'],
+            'semantic_keys': result['semantic_keys'],
+            'processing_time': result['processing_time']
+        }
+        
+        # Add metadata if provided
+        if metadata:
+            storage_data['metadata'] = metadata
+        
+        # Generate memory_id first
+        memory_id = db_manager.stats['total_memories']
+        
+        # TURBO MODE: Create links using RAM cache for speed
+        embedded_links = {'succession_links': [], 'radial_links': [], 'total_links': 0}
+        semantic_links = None
+        
+        if self.enable_linking:
+            embedded_links = self._create_turbo_links(memory_id, coord_vec, text)
+            semantic_links = _links_to_record(embedded_links)
+        
+        # Store in database WITH embedded links (single write)
+        final_memory_id = db_manager.store_memory_in_txn(
+            txn,
+            input_text=text,
+            semantic_summary=result['summary'],
+            coordinates=result['coordinates'],
+            metadata=storage_data,
+            semantic_links=semantic_links,
+            coord_key=coord_key_bytes
+        )
+        
+        if final_memory_id is not None:
+            self.total_stored += 1
             
-            # Prepare storage data
-            storage_data = {
-                'input_text': text,
-                'semantic_summary': result['summary'],
+            # Add to RAM cache for future linking
+            cache_entry = {
+                'id': final_memory_id,
                 'coordinates': result['coordinates'],
-                'coordinate_key': result['coordinate_key'],
-                'semantic_keys': result['semantic_keys'],
-                'processing_time': result['processing_time']
+                'content': text,
+                'summary': text[:100] + "..." if len(text) > 100 else text,
+                'coord_key': result['coordinate_key'],
+                'coord_key_bytes': coord_key_bytes
             }
             
-            # Add metadata if provided
-            if metadata:
-                storage_data['metadata'] = metadata
+            # Overwrite the oldest slot once the ring is full
+            slot = self._cache_head % self.cache_size
+            evicted = self.memory_cache[slot]
+            if evicted is not None:
+                self._cache_by_id.pop(evicted['id'], None)
+            self.memory_cache[slot] = cache_entry
+            self._cache_by_id[final_memory_id] = slot
+            self._cache_coords[slot] = coord_vec
+            self._cache_head += 1
+            if self._cache_count < self.cache_size:
+                self._cache_count += 1
             
-            # Generate memory_id first
-            memory_id = self.db_manager.stats['total_memories']
+            # TURBO: Batch update previous memories with backward links
+            self._queue_backward_link_updates(final_memory_id, embedded_links, txn)
             
-            # TURBO MODE: Create links using RAM cache for speed
-            embedded_links = {'succession_links': [], 'radial_links': [], 'total_links': 0}
+            if self.verbose:
+                links_count = embedded_links.get('total_links', 0)
+                print(f"🧠 Memory {final_memory_id} stored: {result['coordinate_key']} | "
+                      f"Links: {links_count} embedded")
+        
+        return final_memory_id
+    
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate 9D coordinates for many texts in one pass
+        
+        Returns:
+            float32 (N, 9) coordinate matrix, one row per text (AXES order)
+        """
+        results = self._encode_texts(texts)
+        return coords_to_matrix(result['coordinates'] for result in results)
+    
+    def _stored_analysis(self, text: str, txn=None) -> Optional[Dict]:
+        """
+        coord_system.process(text) fields rebuilt from a stored memory with exactly this text
+        
+        The analysis is deterministic, so repeated content (re-ingested
+        corpora, looping agents) is one index lookup instead of a re-analysis.
+        Only consulted on an analysis_cache miss, and a record is decoded
+        only when the text-hash index has the text: unique text pays one
+        index probe (in txn, when a write transaction is open).
+        Returns None when no such memory (stored by this manager) exists.
+        """
+        processor = self.coord_system.processor
+        if processor.cache_key(text) in processor.analysis_cache:
+            return None  # coord_system.process is a cache lookup already
+        
+        db_manager = self.db_manager
+        with db_manager.read_scope():
+            probe_txn = txn if txn is not None else db_manager._read_txn()
+            if probe_txn.get(db_manager._text_hash(text), db=db_manager.hash_db) is None:
+                return None
             
-            if self.enable_linking:
-                embedded_links = self._create_turbo_links(memory_id, result['coordinates'], text)
-                storage_data['semantic_links'] = embedded_links
+            memory_data = db_manager.get_memory_by_text(text)
+        storage_data = memory_data.get('metadata') if memory_data else None
+        if not storage_data or 'semantic_keys' not in storage_data:
+            return None
+        return {
+            'summary': storage_data['semantic_summary'],
+            'semantic_keys': storage_data['semantic_keys'],
+            'coordinates': storage_data['coordinates'],
+            'coordinate_key': storage_data['coordinate_key'],
+            'processing_time': storage_data['processing_time']
+        }
+    
+    def _encode_texts(self, texts: List[str]) -> List[Dict]:
+        """
+        Analyses for texts: stored ones reused, the rest via _analyze_texts
+        """
+        results = [self._stored_analysis(text) for text in texts]
+        misses = [index for index, result in enumerate(results) if result is None]
+        if misses:
+            fresh = self._analyze_texts([texts[index] for index in misses])
+            for index, result in zip(misses, fresh):
+                results[index] = result
+        return results
+    
+    def _analyze_texts(self, texts: List[str]) -> List[Dict]:
+        """
+        coord_system.process_batch, sharded across the encode pool when large
+        
+        The analysis is pure Python and holds the GIL, so only separate
+        processes run it in parallel. Shards come back in input order, and
+        the workers' analyses and stat counts are folded into this
+        process's coordinate system so cache stats stay accurate.
+        """
+        if self.encode_workers < 2 or len(texts) < PARALLEL_ENCODE_MIN_TEXTS:
+            return self.coord_system.process_batch(texts)
+        
+        if self._encode_pool is None:
+            self._encode_pool = ProcessPoolExecutor(max_workers=self.encode_workers,
+                                                    initializer=_init_encode_worker)
+        
+        shard_size = -(-len(texts) // self.encode_workers)  # ceil division
+        shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+        processor = self.coord_system.processor
+        results = []
+        for shard_results, shard_stats in self._encode_pool.map(_encode_chunk, shards):
+            results.extend(shard_results)
+            for name, count in shard_stats.items():
+                processor.stats[name] = processor.stats.get(name, 0) + count
+        
+        # Cache the workers' analyses here, as if they had run in-process
+        analysis_cache = processor.analysis_cache
+        for text, result in zip(texts, results):
+            analysis_cache.setdefault(processor.cache_key(text), result['enhanced_analysis'])
+        self.coord_system.total_processed += len(results)
+        return results
+    
+    def store_memories_batch(self, texts: List[str], metadatas: Optional[List[Optional[Dict]]] = None,
+                             batch_size: Optional[int] = None) -> List[Optional[int]]:
+        """
+        Store many texts with one write transaction per batch
+        
+        Coordinates are generated for each batch up front (and converted to
+        one float32 matrix for the linking math), then every memory
+        put, its links and any backward-link updates share a single commit.
+        
+        Args:
+            texts: Input texts to store
+            metadatas: Optional metadata dict per text (same length as texts)
+            batch_size: Texts per write transaction (default: self.batch_size)
             
-            # Store in database WITH embedded links (single write)
-            final_memory_id = self.db_manager.store_memory(
-                input_text=text,
-                semantic_summary=result['summary'],
-                coordinates=result['coordinates'],
-                metadata=storage_data
-            )
+        Returns:
+            List of memory IDs in input order (None where a store failed)
+        """
+        batch_size = batch_size or self.batch_size
+        if metadatas is None:
+            metadatas = [None] * len(texts)
+        
+        memory_ids = []
+        for batch_start in range(0, len(texts), batch_size):
+            batch = texts[batch_start:batch_start + batch_size]
+            batch_metadatas = metadatas[batch_start:batch_start + batch_size]
             
-            if final_memory_id is not None:
-                self.total_stored += 1
-                
-                # Add to RAM cache for future linking
-                cache_entry = {
-                    'id': final_memory_id,
-                    'coordinates': result['coordinates'],
-                    'content': text,
-                    'coord_key': result['coordinate_key'],
-                    'storage_data': storage_data.copy()
-                }
-                
-                self.memory_cache.append(cache_entry)
-                
-                # Keep cache at reasonable size
-                if len(self.memory_cache) > self.cache_size:
-                    self.memory_cache.pop(0)
-                
-                # TURBO: Batch update previous memories with backward links
-                self._queue_backward_link_updates(final_memory_id, embedded_links)
-                
-                if self.verbose:
-                    links_count = embedded_links.get('total_links', 0)
-                    print(f"🧠 Memory {final_memory_id} stored: {result['coordinate_key']} | "
-                          f"Links: {links_count} embedded")
+            try:
+                results = self._encode_texts(batch)
+                coord_matrix = coords_to_matrix(result['coordinates'] for result in results)
+            except Exception:
+                results = [None] * len(batch)
+                coord_matrix = [None] * len(batch)
             
-            return final_memory_id
+            batch_ids = []
+            try:
+                with self.db_manager.env.begin(write=True, buffers=True) as txn:
+                    for text, metadata, result, coord_vec in zip(batch, batch_metadatas, results, coord_matrix):
+                        batch_ids.append(self.store_memory_in_txn(txn, text, metadata,
+                                                                  result=result, coord_vec=coord_vec))
+                    self.db_manager._maybe_save_stats(txn)
+            except Exception as e:
+                # The transaction aborted: none of this batch was stored
+                self._log(f"❌ Batch storage failed ({len(batch)} memories rolled back): {e}")
+                batch_ids = [None] * len(batch)
+            self.db_manager._invalidate_reads()
+            memory_ids.extend(batch_ids)
+        
+        return memory_ids
+    
+    def find_memory_by_text(self, text: str) -> Optional[int]:
+        """
+        Look up an already stored memory by its exact text
+        
+        Args:
+            text: Input text to look for
             
+        Returns:
+            int: Memory ID if this exact text is stored, None otherwise
+        """
+        try:
+            return self.db_manager.get_memory_id_by_text(text)
         except Exception as e:
-            if self.verbose:
-                print(f"❌ Storage failed: {e}")
+            self._log(f"❌ Text lookup failed: {e}")
             return None
     
     def retrieve_by_coordinates(self, coordinates: Dict[str, float]) -> Optional[Dict]:
@@ -207,8 +505,7 @@ class EngramManager:
             return result
             
         except Exception as e:
-            if self.verbose:
-                print(f"❌ Retrieval failed: {e}")
+            self._log(f"❌ Retrieval failed: {e}")
             return None
     
     def search_similar(self, query_text: str, max_results: int = 5) -> List[Dict]:
@@ -223,30 +520,69 @@ class EngramManager:
             List[Dict]: Similar memories
         """
         try:
-            # Process query to get coordinates
-            query_result = self.coord_system.process(query_text)
-            query_coords = query_result['coordinates']
-            
-            # Search database
-            results = self.db_manager.search_by_coordinates(
-                query_coords=query_coords,
-                radius=0.5,  # Search radius in coordinate space
-                max_results=max_results,
-                search_strategy='radius'
-            )
+            # One read snapshot for the whole search (stored-analysis probe
+            # + lookup), aborted on exit so no idle thread pins it
+            with self.db_manager.read_scope():
+                # Process query to get coordinates (cached per query text)
+                query_coords = self._embed_query(query_text)
+                
+                # Search database
+                results = self.db_manager.search_by_coordinates(
+                    query_coords=query_coords,
+                    radius=0.5,  # Search radius in coordinate space
+                    max_results=max_results,
+                    search_strategy='radius'
+                )
             
             if results:
                 self.total_retrieved += len(results)
-                if self.verbose:
-                    print(f"🔍 Found {len(results)} similar memories")
+                self._log(f"🔍 Found {len(results)} similar memories")
             
             return results
             
         except Exception as e:
-            if self.verbose:
-                print(f"❌ Search failed: {e}")
+            self._log(f"❌ Search failed: {e}")
             return []
     
+    def search_similar_batch(self, query_texts: List[str], max_results: int = 5) -> List[List[Dict]]:
+        """
+        search_similar for many queries, scored in one batched distance sweep
+        
+        Args:
+            query_texts: Query texts
+            max_results: Maximum number of results per query
+            
+        Returns:
+            List[List[Dict]]: Similar memories per query, in input order
+        """
+        try:
+            with self.db_manager.read_scope():
+                query_coords = [self._embed_query(query_text) for query_text in query_texts]
+                
+                all_results = self.db_manager.search_by_coordinates_batch(
+                    query_coords_list=query_coords,
+                    radius=0.5,  # Same search radius as search_similar
+                    max_results=max_results
+                )
+            
+            found = sum(len(results) for results in all_results)
+            if found:
+                self.total_retrieved += found
+                self._log(f"🔍 Found {found} similar memories for {len(query_texts)} queries")
+            
+            return all_results
+            
+        except Exception as e:
+            self._log(f"❌ Batch search failed: {e}")
+            return [[] for _ in query_texts]
+    
+    def _compute_query_vec(self, query_text: str) -> np.ndarray:
+        """Query text -> float32 (9,) coordinate vector (backs the _embed_query LRU cache)"""
+        result = self._stored_analysis(query_text) or self.coord_system.process(query_text)
+        query_vec = coords_to_vec(result['coordinates'])
+        query_vec.flags.writeable = False  # Shared by every cache hit
+        return query_vec
+    
     def process_text_list(self, text_list: List[str], show_progress: bool = True) -> Dict:
         """
         Process a list of texts for bulk storage
@@ -265,18 +601,22 @@ class EngramManager:
         if show_progress:
             print(f"📚 Processing {len(text_list)} texts...")
         
-        for i, text in enumerate(text_list):
-            if show_progress and i % 100 == 0 and i > 0:
-                elapsed = time.time() - start_time
-                rate = i / elapsed
-                print(f"   Progress: {i}/{len(text_list)} | Rate: {rate:.1f} texts/sec")
+        # One write transaction per batch_size texts: a single commit covers
+        # the memory puts, stats and any backward-link batch updates.
+        # Progress is reported per committed batch, never inside the loop.
+        for batch_start in range(0, len(text_list), self.batch_size):
+            batch = text_list[batch_start:batch_start + self.batch_size]
             
-            memory_id = self.store_memory(text)
+            for memory_id in self.store_memories_batch(batch):
+                if memory_id is not None:
+                    stored_count += 1
+                else:
+                    failed_count += 1
             
-            if memory_id is not None:
-                stored_count += 1
-            else:
-                failed_count += 1
+            if show_progress:
+                done = batch_start + len(batch)
+                rate = done / max(time.time() - start_time, 1e-9)
+                print(f"   Progress: {done}/{len(text_list)} | Rate: {rate:.1f} texts/sec")
         
         total_time = time.time() - start_time
         
@@ -309,8 +649,7 @@ class EngramManager:
             List of linked memory data
         """
         if not self.enable_linking or not self.semantic_linker:
-            if self.verbose:
-                print("⚠️ Semantic linking not enabled")
+            self._log("⚠️ Semantic linking not enabled")
             return []
         
         return self.semantic_linker.find_linked_memories(
@@ -333,8 +672,7 @@ class EngramManager:
             List of nearby memories
         """
         if not self.enable_linking or not self.semantic_linker:
-            if self.verbose:
-                print("⚠️ Semantic linking not enabled")
+            self._log("⚠️ Semantic linking not enabled")
             return []
         
         return self.semantic_linker.find_spatial_neighborhood(
@@ -343,16 +681,44 @@ class EngramManager:
             max_results=max_results
         )
     
+    @property
+    def turbo_stats(self) -> Dict:
+        """TURBO link statistics, rebuilt from the counters on demand"""
+        return {
+            'succession_links': self._ts_succession,
+            'radial_links': self._ts_radial,
+            'total_links': self._ts_succession + self._ts_radial,
+            'memories_with_links': self._ts_mem_with_links
+        }
+    
+    def get_cheap_stats(self) -> Dict:
+        """
+        O(1) memory count and file size for per-write results
+        
+        Reads the in-process ID counter and the LMDB environment header
+        only; get_system_stats has the full breakdown.
+        """
+        env = self.db_manager.env
+        allocated_bytes = (env.info()['last_pgno'] + 1) * env.stat()['psize']
+        return {
+            'database_memories': self.db_manager.stats['total_memories'],
+            'database_size_mb': allocated_bytes / (1024 * 1024)
+        }
+    
     def get_system_stats(self) -> Dict:
         """Get comprehensive system statistics"""
         coord_stats = self.coord_system.get_stats()
         db_stats = self.db_manager.get_memory_statistics()
         
+        # The coordinate processor counts cache hits and fresh analyses
+        cache_hits = coord_stats.get('cache_hits', 0)
+        cache_lookups = cache_hits + coord_stats.get('processed', 0)
+        
         stats = {
             'total_stored': self.total_stored,
             'total_retrieved': self.total_retrieved,
-            'coordinate_cache_size': coord_stats['cache_size'],
-            'coordinate_cache_rate': coord_stats['cache_rate'],
+            'coordinate_cache_size': len(self.coord_system.processor.analysis_cache),
+            'coordinate_cache_rate': 100.0 * cache_hits / max(cache_lookups, 1),  # percent
             'database_memories': db_stats['total_memories'],
             'database_size_mb': db_stats['database_size_mb'],
             'semantic_linking_enabled': self.enable_linking
@@ -361,74 +727,28 @@ class EngramManager:
         # Add semantic linking stats if enabled
         if self.enable_linking:
             # TURBO: Use TURBO stats instead of semantic_linker
-            avg_links = self.turbo_stats['total_links'] / max(1, self.total_stored)
+            turbo_stats = self.turbo_stats
+            avg_links = turbo_stats['total_links'] / max(1, self.total_stored)
             stats.update({
-                'succession_links': self.turbo_stats['succession_links'],
-                'radial_links': self.turbo_stats['radial_links'],
-                'total_semantic_links': self.turbo_stats['total_links'],
+                'succession_links': turbo_stats['succession_links'],
+                'radial_links': turbo_stats['radial_links'],
+                'total_semantic_links': turbo_stats['total_links'],
                 'avg_links_per_memory': round(avg_links, 2)
             })
         
         return stats
     
-    def _create_embedded_links_data(self, links: List[Dict]) -> Dict:
-        """
-        🔗 CREATE EMBEDDED LINKS DATA WITH SUMMARIES
-        
-        Creates the embedded links structure that will be stored with the memory
-        
-        Args:
-            links: List of link dictionaries from semantic linker
-            
-        Returns:
-            Dict: Embedded links structure with summaries
-        """
-        embedded_links = {
-            'succession_links': [],
-            'radial_links': [],
-            'total_links': len(links)
-        }
-        
-        for link in links:
-            # Find the target memory to get its content
-            target_memory = self.semantic_linker.get_memory_by_id(link['target_id'])
-            
-            if target_memory:
-                # Create coordinate key for the linked memory
-                target_coord_key = self.coord_system.generate_coordinate_key(target_memory['coordinates'])
-                
-                # Generate summary title from target memory content
-                target_content = target_memory.get('content', '')
-                target_summary = target_content[:100] + "..." if len(target_content) > 100 else target_content
-                
-                embedded_link = {
-                    'target_memory_id': link['target_id'],
-                    'target_coordinate_key': target_coord_key,
-                    'target_coordinates': target_memory['coordinates'],
-                    'summary': target_summary,  # Add summary title!
-                    'link_type': link['type'],
-                    'strength': round(link['strength'], 3),
-                    'distance': round(link['distance'], 3)
-                }
-                
-                # Add to appropriate category
-                if link['type'] == 'succession':
-                    embedded_links['succession_links'].append(embedded_link)
-                elif link['type'] == 'radial':
-                    embedded_links['radial_links'].append(embedded_link)
-        
-        return embedded_links
-    
-    def _create_turbo_links(self, memory_id: int, coordinates: Dict[str, float], content: str) -> Dict:
+    def _create_turbo_links(self, memory_id: int, coord_vec: np.ndarray, content: str) -> Dict:
         """
         🚀 TURBO LINKING: Create links using RAM cache for maximum speed
         
         Uses recently cached memories instead of database reads for linking.
-        Creates succession links to last 5 memories and spatial links within threshold.
+        Radial candidates come from one compiled top-k pass over the SoA
+        coordinate cache.
         
         Args:
             memory_id: New memory ID
-            coordinates: New memory coordinates  
+            coord_vec: New memory coordinates as a float32 (9,) vector
             content: New memory content
             
         Returns:
@@ -436,122 +756,111 @@ class EngramManager:
         """
         embedded_links = {'succession_links': [], 'radial_links': [], 'total_links': 0}
         
-        if not self.memory_cache:
+        cache_len = self._cache_count
+        if not cache_len:
             return embedded_links
+        memory_cache = self.memory_cache
+        
+        cache_coords = self._cache_coords[:cache_len]
         
         # LINEAR SUCCESSION LINKS: Link ONLY to immediate predecessor (true chain)
-        if self.memory_cache:
-            # Get the immediately previous memory (last in cache)
-            previous_memory = self.memory_cache[-1]
-            
-            # Calculate distance to immediate predecessor
-            distance = self._calculate_coordinate_distance(coordinates, previous_memory['coordinates'])
-            
-            # Create single backward link to immediate predecessor
-            succession_link = {
-                'target_memory_id': previous_memory['id'],
-                'target_coordinate_key': previous_memory['coord_key'],
-                'target_coordinates': previous_memory['coordinates'],
-                'summary': previous_memory['content'][:100] + "...",
-                'link_type': 'succession',
-                'strength': 0.9,  # High strength for immediate succession
-                'distance': round(distance, 3)
-            }
-            
-            embedded_links['succession_links'].append(succession_link)
+        previous_slot = (self._cache_head - 1) % self.cache_size
+        previous_memory = memory_cache[previous_slot]
+        distance = sqrt(dist9_sq(cache_coords[previous_slot], coord_vec))
+        
+        # Create single backward link to immediate predecessor
+        succession_link = Link(
+            target_memory_id=previous_memory['id'],
+            target_coordinate_key=previous_memory['coord_key'],
+            target_coordinates=previous_memory['coordinates'],
+            summary=previous_memory['summary'],
+            link_type='succession',
+            strength=0.9,  # High strength for immediate succession
+            distance=round(distance, 3)
+        )
+        
+        embedded_links['succession_links'].append(succession_link)
         
         # RADIAL LINKS: Find spatially similar memories within threshold
-        radial_threshold = 0.6
-        max_radial_links = 3
-        radial_candidates = []
-        
-        for cached_memory in self.memory_cache[:-1]:  # Exclude immediate predecessor
-            distance = self._calculate_coordinate_distance(coordinates, cached_memory['coordinates'])
-            
-            if distance <= radial_threshold:
-                radial_strength = 1.0 - (distance / radial_threshold)
-                radial_candidates.append({
-                    'memory': cached_memory,
-                    'distance': distance,
-                    'strength': radial_strength
-                })
-        
-        # Sort by strength and take top candidates
-        radial_candidates.sort(key=lambda x: x['strength'], reverse=True)
-        selected_radial = radial_candidates[:max_radial_links]
-        
-        for candidate in selected_radial:
-            cached_memory = candidate['memory']
-            
-            radial_link = {
-                'target_memory_id': cached_memory['id'],
-                'target_coordinate_key': cached_memory['coord_key'],
-                'target_coordinates': cached_memory['coordinates'],
-                'summary': cached_memory['content'][:100] + "...",
-                'link_type': 'radial',
-                'strength': round(candidate['strength'], 3),
-                'distance': round(candidate['distance'], 3)
-            }
+        radial_threshold = self.radial_threshold
+        max_radial_links = self.max_radial_links
+        
+        # One compiled pass: the closest cached memories within the threshold,
+        # closest first (== strongest first), plus one spare in case the
+        # immediate predecessor (excluded below) is among them
+        rows, distances_sq = radial_top_k(cache_coords, coord_vec, self._radial_threshold_sq,
+                                          max_radial_links + 1)
+        selected_radial = [(index, distance_sq)
+                           for index, distance_sq in zip(rows.tolist(), distances_sq.tolist())
+                           if index != previous_slot][:max_radial_links]
+        
+        for index, distance_sq in selected_radial:
+            cached_memory = memory_cache[index]
+            distance = sqrt(distance_sq)
+            
+            radial_link = Link(
+                target_memory_id=cached_memory['id'],
+                target_coordinate_key=cached_memory['coord_key'],
+                target_coordinates=cached_memory['coordinates'],
+                summary=cached_memory['summary'],
+                link_type='radial',
+                strength=round(1.0 - (distance / radial_threshold), 3),
+                distance=round(distance, 3)
+            )
             
             embedded_links['radial_links'].append(radial_link)
         
         # Update total count
-        embedded_links['total_links'] = len(embedded_links['succession_links']) + len(embedded_links['radial_links'])
+        succession_count = len(embedded_links['succession_links'])
+        radial_count = len(embedded_links['radial_links'])
+        embedded_links['total_links'] = succession_count + radial_count
         
         # TURBO: Update link statistics
-        self.turbo_stats['succession_links'] += len(embedded_links['succession_links'])
-        self.turbo_stats['radial_links'] += len(embedded_links['radial_links'])
-        self.turbo_stats['total_links'] += embedded_links['total_links']
+        self._ts_succession += succession_count
+        self._ts_radial += radial_count
         if embedded_links['total_links'] > 0:
-            self.turbo_stats['memories_with_links'] += 1
+            self._ts_mem_with_links += 1
         
         return embedded_links
     
-    def _calculate_coordinate_distance(self, coords1: Dict[str, float], coords2: Dict[str, float]) -> float:
-        """Calculate 9D Euclidean distance between coordinates"""
-        distance = 0.0
-        axes = ['x', 'y', 'z', 'a', 'b', 'c', 'd', 'e', 'f']
-        
-        for axis in axes:
-            val1 = coords1.get(axis, 0.0)
-            val2 = coords2.get(axis, 0.0)
-            distance += (val1 - val2) ** 2
-        
-        return math.sqrt(distance)
-    
-    def _queue_backward_link_updates(self, new_memory_id: int, forward_links: Dict):
+    def _queue_backward_link_updates(self, new_memory_id: int, forward_links: Dict, txn=None):
         """
         🚀 TURBO: Queue backward link updates for batch processing
         
         Instead of immediately writing each backward link, queue them
         for batch processing every N memories for speed.
         """
+        # The new memory was just cached: everything about it is loop-invariant
+        new_entry = self.memory_cache[(self._cache_head - 1) % self.cache_size]
+        new_coord_key = new_entry['coord_key']
+        new_coordinates = new_entry['coordinates']
+        new_summary = new_entry['summary']
+        
         for link in forward_links['succession_links'] + forward_links['radial_links']:
-            target_id = link['target_memory_id']
+            target_id = link.target_memory_id
             
             # Find target in cache
-            target_cache_entry = None
-            for cached_memory in self.memory_cache:
-                if cached_memory['id'] == target_id:
-                    target_cache_entry = cached_memory
-                    break
+            slot = self._cache_by_id.get(target_id)
             
-            if target_cache_entry:
+            if slot is not None:
+                target_cache_entry = self.memory_cache[slot]
+                
                 # Create backward link
-                backward_link = {
-                    'target_memory_id': new_memory_id,
-                    'target_coordinate_key': self.coord_system.generate_coordinate_key(self._get_last_coordinates()),
-                    'target_coordinates': self._get_last_coordinates(),
-                    'summary': self._get_last_content()[:100] + "...",
-                    'link_type': link['link_type'],
-                    'strength': link['strength'],
-                    'distance': link['distance']
-                }
+                backward_link = Link(
+                    target_memory_id=new_memory_id,
+                    target_coordinate_key=new_coord_key,
+                    target_coordinates=new_coordinates,
+                    summary=new_summary,
+                    link_type=link.link_type,
+                    strength=link.strength,
+                    distance=link.distance
+                )
                 
                 # Queue update for target memory
                 if target_id not in self.pending_updates:
                     self.pending_updates[target_id] = {
                         'coordinates': target_cache_entry['coordinates'],
+                        'coord_key_bytes': target_cache_entry['coord_key_bytes'],
                         'new_links': []
                     }
                 
@@ -559,70 +868,81 @@ class EngramManager:
         
         # Process batch updates with dynamic batch size for efficiency
         if len(self.pending_updates) >= self.batch_size:
-            self._process_batch_updates()
-    
-    def _get_last_coordinates(self) -> Dict[str, float]:
-        """Get coordinates of the most recently added memory"""
-        if self.memory_cache:
-            return self.memory_cache[-1]['coordinates']
-        return {}
-    
-    def _get_last_content(self) -> str:
-        """Get content of the most recently added memory"""
-        if self.memory_cache:
-            return self.memory_cache[-1]['content']
-        return ""
+            self._process_batch_updates(txn)
     
-    def _process_batch_updates(self):
+    def _process_batch_updates(self, txn=None):
         """
         🚀 TURBO: Process queued backward link updates in a single transaction
         
         This dramatically reduces database writes by batching all updates.
+        
+        Args:
+            txn: Optional open write transaction to fold the updates into
         """
         if not self.pending_updates:
             return
         
+        if txn is None:
+            with self.db_manager.env.begin(write=True, buffers=True) as txn:
+                self._process_batch_updates(txn)
+            self.db_manager._invalidate_reads()
+            return
+        
         updated_count = 0
         
-        # Use single transaction for all updates
-        with self.db_manager.env.begin(write=True) as txn:
-            for target_id, update_info in self.pending_updates.items():
+        # All updates share the given transaction and touch only the small
+        # links blobs, never the stored records. Visiting targets in key order
+        # walks the B-tree sequentially; one cursor serves every lookup and
+        # the final sorted putmulti.
+        db_manager = self.db_manager
+        pending = sorted(self.pending_updates.items(), key=lambda item: (item[1]['coord_key_bytes'], item[0]))
+        # Targets sharing a key (duplicate text/coordinates): a later store
+        # overwrote the record, and ids only grow, so the highest id owns it.
+        # The older targets no longer exist - drop their updates
+        pending = [item for i, item in enumerate(pending)
+                   if i + 1 == len(pending) or pending[i + 1][1]['coord_key_bytes'] != item[1]['coord_key_bytes']]
+        updated_records = []
+        with txn.cursor(db=db_manager.links_db) as cursor:
+            for target_id, update_info in pending:
                 try:
-                    # Retrieve current memory
-                    coord_key = self.db_manager._create_coordinate_key(update_info['coordinates'])
-                    memory_value = txn.get(coord_key)
+                    coord_key = update_info['coord_key_bytes']
+                    # Zero-copy view into the map: only valid until the next put,
+                    # so decode it fully first
+                    links_value = cursor.value() if cursor.set_key(coord_key) else None
                     
-                    if memory_value:
-                        stored_memory = pickle.loads(memory_value)
-                        
-                        # Initialize semantic_links if not exists
-                        if 'semantic_links' not in stored_memory:
-                            stored_memory['semantic_links'] = {
-                                'succession_links': [],
-                                'radial_links': [],
-                                'total_links': 0
-                            }
-                        
-                        # Add new backward links
-                        for new_link in update_info['new_links']:
-                            if new_link['link_type'] == 'succession':
-                                stored_memory['semantic_links']['succession_links'].append(new_link)
-                            elif new_link['link_type'] == 'radial':
-                                stored_memory['semantic_links']['radial_links'].append(new_link)
-                        
-                        # Update total count
-                        total_links = (len(stored_memory['semantic_links']['succession_links']) + 
-                                     len(stored_memory['semantic_links']['radial_links']))
-                        stored_memory['semantic_links']['total_links'] = total_links
-                        
-                        # Write back to database
-                        updated_value = pickle.dumps(stored_memory)
-                        txn.put(coord_key, updated_value)
-                        updated_count += 1
+                    semantic_links = db_manager._decode_value(links_value) if links_value is not None else None
+                    if semantic_links is None:
+                        # Stored without links (or before the links sub-database)
+                        memory_value = txn.get(coord_key)
+                        stored_memory = db_manager._decode_value(memory_value) if memory_value else None
+                        if stored_memory is None:
+                            continue
+                        semantic_links = stored_memory.get('semantic_links') or {}
+                    
+                    # Initialize link lists if not present
+                    semantic_links.setdefault('succession_links', [])
+                    semantic_links.setdefault('radial_links', [])
+                    
+                    # Add new backward links
+                    for new_link in update_info['new_links']:
+                        if new_link.link_type == 'succession':
+                            semantic_links['succession_links'].append(new_link.to_dict())
+                        elif new_link.link_type == 'radial':
+                            semantic_links['radial_links'].append(new_link.to_dict())
+                    
+                    # Update total count
+                    semantic_links['total_links'] = (len(semantic_links['succession_links']) +
+                                                     len(semantic_links['radial_links']))
+                    
+                    updated_records.append((coord_key, db_manager._encode_value(semantic_links)))
+                    updated_count += 1
                         
                 except Exception as e:
-                    if self.verbose:
-                        print(f"⚠️ Failed to update memory {target_id}: {e}")
+                    self._log(f"⚠️ Failed to update memory {target_id}: {e}")
+            
+            # Write back to database
+            if updated_records:
+                cursor.putmulti(updated_records)
         
         if self.verbose and updated_count > 0:
             print(f"🚀 TURBO: Batch updated {updated_count} memories with backward links")
@@ -630,160 +950,6 @@ class EngramManager:
         # Clear processed updates
         self.pending_updates.clear()
     
-    def _embed_links_in_stored_memory(self, memory_id: int, coordinates: Dict[str, float], links: List[Dict]):
-        """
-        🔗 EMBED LINKS DIRECTLY INTO STORED MEMORY DATA WITH SUMMARIES
-        
-        This ensures that when you retrieve a memory by coordinates,
-        you get ALL related coordinate keys AND summaries in a single lookup!
-        
-        Args:
-            memory_id: The memory ID to update
-            coordinates: The memory's coordinates
-            links: List of link dictionaries from semantic linker
-        """
-        try:
-            # Retrieve the current memory data
-            stored_memory = self.db_manager.get_memory_by_coordinates(coordinates)
-            
-            if stored_memory:
-                # Create embedded link data with coordinate keys AND summaries
-                embedded_links = {
-                    'succession_links': [],
-                    'radial_links': [],
-                    'total_links': len(links)
-                }
-                
-                for link in links:
-                    # Find the target memory to get its coordinates and content
-                    target_memory = self.semantic_linker.get_memory_by_id(link['target_id'])
-                    
-                    if target_memory:
-                        # Create coordinate key for the linked memory
-                        target_coord_key = self.coord_system.generate_coordinate_key(target_memory['coordinates'])
-                        
-                        # Generate summary title from target memory content
-                        target_content = target_memory.get('content', '')
-                        target_summary = target_content[:100] + "..." if len(target_content) > 100 else target_content
-                        
-                        embedded_link = {
-                            'target_memory_id': link['target_id'],
-                            'target_coordinate_key': target_coord_key,
-                            'target_coordinates': target_memory['coordinates'],
-                            'summary': target_summary,  # Add summary title!
-                            'link_type': link['type'],
-                            'strength': round(link['strength'], 3),
-                            'distance': round(link['distance'], 3)
-                        }
-                        
-                        # Add to appropriate category
-                        if link['type'] == 'succession':
-                            embedded_links['succession_links'].append(embedded_link)
-                        elif link['type'] == 'radial':
-                            embedded_links['radial_links'].append(embedded_link)
-                
-                # Add embedded links to the stored memory data
-                stored_memory['semantic_links'] = embedded_links
-                
-                # Re-store the memory with embedded links using coordinate key
-                coord_key = self._create_coordinate_key(coordinates)
-                
-                # Store using enhanced DB manager with the coordinate key
-                with self.db_manager.env.begin(write=True) as txn:
-                    memory_value = pickle.dumps(stored_memory)
-                    txn.put(coord_key, memory_value)
-                
-                if self.verbose:
-                    print(f"      🔗 Embedded {len(links)} links with summaries into memory {memory_id}")
-                    
-        except Exception as e:
-            if self.verbose:
-                print(f"❌ Failed to embed links for memory {memory_id}: {e}")
-    
-    def _create_coordinate_key(self, coordinates):
-        """Create coordinate key for direct database storage"""
-        import json
-        axes = ['x', 'y', 'z', 'a', 'b', 'c', 'd', 'e', 'f']
-        coord_values = []
-        
-        for axis in axes:
-            if axis in coordinates:
-                coord_values.append(round(float(coordinates[axis]), 3))
-            else:
-                coord_values.append(0.0)
-        
-        coord_key = json.dumps(coord_values)
-        return coord_key.encode()
-
-    def _update_backward_links(self, new_memory_id: int):
-        """
-        🔄 UPDATE PREVIOUSLY STORED MEMORIES WITH BACKWARD LINKS
-        
-        When a new memory links to previous memories, we need to update
-        those previous memories to include backward links to the new memory.
-        """
-        try:
-            # Get links from the new memory
-            new_memory_links = self.semantic_linker.get_memory_links(new_memory_id)
-            
-            for link in new_memory_links:
-                target_id = link['target_id']
-                
-                # Get the target memory from semantic linker
-                target_memory_data = self.semantic_linker.get_memory_by_id(target_id)
-                
-                if target_memory_data:
-                    target_coords = target_memory_data['coordinates']
-                    
-                    # Retrieve stored target memory
-                    stored_target = self.db_manager.get_memory_by_coordinates(target_coords)
-                    
-                    if stored_target:
-                        # Initialize semantic_links if not exists
-                        if 'semantic_links' not in stored_target:
-                            stored_target['semantic_links'] = {
-                                'succession_links': [],
-                                'radial_links': [],
-                                'total_links': 0
-                            }
-                        
-                        # Get new memory data for backward link
-                        new_memory_data = self.semantic_linker.get_memory_by_id(new_memory_id)
-                        
-                        if new_memory_data:
-                            new_coord_key = self.coord_system.generate_coordinate_key(new_memory_data['coordinates'])
-                            
-                            # Create backward link
-                            backward_link = {
-                                'target_memory_id': new_memory_id,
-                                'target_coordinate_key': new_coord_key,
-                                'target_coordinates': new_memory_data['coordinates'],
-                                'link_type': link['type'],
-                                'strength': link['strength'],
-                                'distance': link['distance']
-                            }
-                            
-                            # Add to appropriate category
-                            if link['type'] == 'succession':
-                                stored_target['semantic_links']['succession_links'].append(backward_link)
-                            elif link['type'] == 'radial':
-                                stored_target['semantic_links']['radial_links'].append(backward_link)
-                            
-                            # Update total count
-                            total_links = (len(stored_target['semantic_links']['succession_links']) + 
-                                         len(stored_target['semantic_links']['radial_links']))
-                            stored_target['semantic_links']['total_links'] = total_links
-                            
-                            # Re-store the updated memory
-                            self.db_manager.store_memory_engram(stored_target)
-                            
-                            if self.verbose:
-                                print(f"      🔄 Updated backward links for memory {target_id}")
-                        
-        except Exception as e:
-            if self.verbose:
-                print(f"❌ Failed to update backward links: {e}")
-
     def switch_to_safe_mode(self):
         """
         🛡️ SWITCH TO SAFE MODE - Enable data durability
@@ -826,10 +992,13 @@ class EngramManager:
         db_info = self.db_manager.get_mode_info()
         return {
             **db_info,
+            'current_mode': db_info['mode'],
+            'turbo_mode': self.db_manager.turbo_mode,
+            'linking_enabled': self.enable_linking,
             'batch_size': self.batch_size,
             'cache_size': self.cache_size,
             'pending_updates': len(self.pending_updates),
-            'cached_memories': len(self.memory_cache)
+            'cached_memories': self._cache_count
         }
 
     def cleanup(self):
@@ -837,14 +1006,17 @@ class EngramManager:
         
         # TURBO: Process any remaining batch updates
         if self.pending_updates:
-            if self.verbose:
-                print(f"🚀 TURBO: Processing final {len(self.pending_updates)} batch updates...")
+            self._log(f"🚀 TURBO: Processing final {len(self.pending_updates)} batch updates...")
             self._process_batch_updates()
         
+        if self._encode_pool is not None:
+            self._encode_pool.shutdown()
+            self._encode_pool = None
+        
         self.db_manager.close()
         if self.verbose:
             print("🧹 Engram Manager V2 cleanup complete")
-            print(f"📊 Cache processed: {len(self.memory_cache)} recent memories")
+            print(f"📊 Cache processed: {self._cache_count} recent memories")
 
 # Quick test
 if __name__ == "__main__":
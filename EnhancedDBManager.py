@@ -21,14 +21,88 @@ Based on the clean DBManager.py approach that actually works!
 import lmdb
 import json
 import pickle
+import msgpack
 import os
 import math
 import time
+import struct
+import zlib
+import hashlib
+import functools
+import sqlite3
+import threading
+import queue
+from contextlib import contextmanager
 import numpy as np
 from typing import List, Dict, Tuple, Optional, Any
+from SpatialKernels import (AXES, coords_to_vec, scan_radius, squared_distances,
+                            squared_distances_many, top_k_order, vec_to_coords)
+
+try:
+    from scipy.spatial import cKDTree
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+# Packed coordinate keys: each axis quantized to 1/1000 and offset into an
+# unsigned 16-bit slot. Big-endian, so byte order == numeric order (x first).
+COORD_KEY_STRUCT = struct.Struct('>9H')
+COORD_KEY_SIZE = COORD_KEY_STRUCT.size  # 18 bytes
+COORD_KEY_SCALE = 1000
+COORD_KEY_OFFSET = 32768
+
+# Secondary index keys: memory id as big-endian uint64 (key order == id order)
+ID_KEY_STRUCT = struct.Struct('>Q')
+
+# Named sub-databases share the environment with the main coordinate DB
+MAX_NAMED_DBS = 8
+
+# Main-database keys that are not memories (stats record, sub-database names)
+NON_MEMORY_KEYS = (b'__stats__', b'id_index', b'links', b'search', b'text_hash')
+
+# Stored values: 4-byte magic + CRC32 of the msgpack payload, so damaged or
+# foreign values are rejected before the decoder ever runs
+RECORD_MAGIC = b'EMv1'
+RECORD_HEADER = struct.Struct('<4sI')
+
+# Append-only copy of every packed coordinate key, in insertion order
+COORDS_FILE = 'coords.bin'
+
+# Puts between stats write-backs (stats also flush the side indexes)
+STATS_FLUSH_INTERVAL = 1000
+
+# KD-tree over the coordinate matrix (scipy): only worth it for large sets.
+# Rows added since the last build are brute-forced until they exceed 1%.
+KDTREE_MIN_ROWS = 4096
+KDTREE_REBUILD_FRACTION = 0.01
+
+# SQLite FTS5 trigram index for substring search, kept inside the DB directory
+TEXT_INDEX_FILE = 'text_index.sqlite3'
+
+# Background writer (async_writes=True): records per commit, and how many
+# staged batches may wait before producers block
+WRITE_BATCH_SIZE = 1000
+WRITE_QUEUE_SIZE = 2048
+
+def _msgpack_default(value):
+    """Fallback for values msgpack can't encode natively (e.g. numpy scalars)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (tuple, set)):
+        return list(value)
+    return str(value)
+
+def _read_scoped(method):
+    """Run a query inside read_scope(): its snapshot is released when it returns"""
+    @functools.wraps(method)
+    def scoped(self, *args, **kwargs):
+        with self.read_scope():
+            return method(self, *args, **kwargs)
+    return scoped
 
 class EnhancedDBManager:
-    def __init__(self, db_path="enhanced_memory.lmdb", max_size=50 * 1024 * 1024 * 1024, turbo_mode=True):
+    def __init__(self, db_path="enhanced_memory.lmdb", max_size=50 * 1024 * 1024 * 1024, turbo_mode=True,
+                 async_writes=False):
         """
         Enhanced database manager with SIMPLE coordinate-based storage
         
@@ -36,17 +110,58 @@ class EnhancedDBManager:
             db_path: Path to the LMDB database
             max_size: Maximum database size in bytes (50GB default)
             turbo_mode: Use TURBO settings for bulk loading vs SAFE settings for production
+            async_writes: Commit store_memory_engram/store_many on a background
+                writer thread (call flush() before reading back fresh writes)
         """
         self.db_path = db_path
         self.turbo_mode = turbo_mode
+        self.max_size = max_size
         os.makedirs(db_path, exist_ok=True)
         
+        # Per-thread cached read transaction, replaced after every write commit
+        self._tls = threading.local()
+        self._write_generation = 0
+        
         # SIMPLE APPROACH - Single database with coordinate keys!
-        if turbo_mode:
+        self._open_env()
+        
+        self.stats = {
+            'total_memories': 0,
+            'last_access_time': time.time(),
+            'cache_hits': 0,
+            'cache_misses': 0
+        }
+        
+        self._dirty_puts = 0
+        
+        self._load_stats()
+        self._backfill_id_index()
+        self._backfill_search_index()
+        stats_recovered = self._recover_stats()
+        self._load_coord_cache()
+        self._open_text_index(rebuild=stats_recovered)
+        
+        # Background writer: producers stage records and enqueue them, one
+        # thread coalesces queued batches into a single write transaction
+        self._write_queue = None
+        self._writer = None
+        # (lost record count, first exception) of failed background commits,
+        # raised from the next flush / close / enqueue
+        self._write_error = None
+        self._write_error_lock = threading.Lock()
+        if async_writes:
+            self._write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+            self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer.start()
+    
+    def _open_env(self):
+        """Open the LMDB environment with the current mode's settings"""
+        if self.turbo_mode:
             # TURBO SETTINGS for MASSIVE databases (882k+ memories)
             self.env = lmdb.open(
-                db_path, 
-                map_size=max_size, 
+                self.db_path, 
+                map_size=self.max_size, 
+                max_dbs=MAX_NAMED_DBS,
                 writemap=True,
                 sync=False,        # TURBO: Disable sync for bulk loading
                 metasync=False,    # TURBO: Disable metadata sync  
@@ -56,8 +171,9 @@ class EnhancedDBManager:
         else:
             # SAFE SETTINGS for production use
             self.env = lmdb.open(
-                db_path, 
-                map_size=max_size, 
+                self.db_path, 
+                map_size=self.max_size, 
+                max_dbs=MAX_NAMED_DBS,
                 writemap=True,
                 sync=True,         # SAFE: Enable sync for data durability
                 metasync=True,     # SAFE: Enable metadata sync
@@ -65,46 +181,365 @@ class EnhancedDBManager:
                 readahead=True     # SAFE: Enable readahead for sequential access
             )
         
-        self.stats = {
-            'total_memories': 0,
-            'last_access_time': time.time(),
-            'cache_hits': 0,
-            'cache_misses': 0
-        }
+        # Secondary index: memory id -> coordinate key
+        self.id_db = self.env.open_db(b'id_index', create=True)
         
-        self._load_stats()
+        # Mutable semantic links live beside the immutable record (same key),
+        # so link updates rewrite a small blob instead of the whole memory
+        self.links_db = self.env.open_db(b'links', create=True)
+        
+        # Lowercased "input\0semantic" per coordinate key, so substring checks
+        # never decode (or re-lowercase) the main record
+        self.search_db = self.env.open_db(b'search', create=True)
+        
+        # Exact-text dedupe: blake2b-128 of the input text -> memory id
+        self.hash_db = self.env.open_db(b'text_hash', create=True)
+    
+    def _read_txn(self):
+        """
+        Thread-local read transaction, reused within one read scope
+        
+        Opened with buffers=True, so gets return zero-copy memoryviews into
+        the map. Replaced once a write has committed so new data is visible.
+        Callers run inside read_scope() (public queries via @_read_scoped),
+        which aborts it on exit.
+        """
+        tls = self._tls
+        txn = getattr(tls, 'txn', None)
+        if txn is None or tls.generation != self._write_generation:
+            if txn is not None:
+                self._abort_quietly(txn)
+            # Read the generation before beginning: a racing commit then
+            # leaves this snapshot marked stale rather than current
+            generation = self._write_generation
+            txn = tls.txn = self.env.begin(buffers=True)
+            tls.cursor = txn.cursor()
+            tls.generation = generation
+        return txn
+    
+    def _read_cursor(self):
+        """Thread-local cursor on the cached read transaction, at the first key"""
+        self._read_txn()
+        cursor = self._tls.cursor
+        cursor.first()
+        return cursor
+    
+    @contextmanager
+    def read_scope(self):
+        """
+        Share one read snapshot across every query inside the block
+        
+        Nested scopes reuse the outer snapshot. Leaving the outermost scope
+        aborts it, so an idle thread (e.g. a reader pool worker) never pins
+        pages that LMDB could otherwise reuse for new writes.
+        """
+        tls = self._tls
+        depth = getattr(tls, 'depth', 0)
+        tls.depth = depth + 1
+        try:
+            yield
+        finally:
+            tls.depth = depth
+            if not depth:
+                self._release_reads()
+    
+    def _release_reads(self):
+        """Abort this thread's cached read transaction, if it holds one"""
+        txn = getattr(self._tls, 'txn', None)
+        if txn is not None:
+            self._tls.txn = self._tls.cursor = None
+            self._abort_quietly(txn)
+    
+    def _invalidate_reads(self):
+        """Mark every cached read transaction stale after a write commit"""
+        self._write_generation += 1
+        # Release this thread's snapshot now rather than at its next read
+        self._release_reads()
+    
+    @staticmethod
+    def _abort_quietly(txn):
+        """Abort a read transaction that may already be invalid (env closed)"""
+        try:
+            txn.abort()
+        except lmdb.Error:
+            pass
+    
+    def _load_coord_cache(self):
+        """
+        Load the search matrix from coords.bin, rebuilding from LMDB if stale
+        
+        coords.bin is a flat file of every packed coordinate key in insertion
+        order, so startup is one sequential read instead of a B-tree walk.
+        It is trusted only when it holds exactly one row per memory key
+        (a crash between LMDB and file writes, or legacy keys, break that).
+        """
+        try:
+            with open(os.path.join(self.db_path, COORDS_FILE), 'rb') as coords_file:
+                packed = coords_file.read()
+        except OSError:
+            packed = None
+        
+        if packed is None or len(packed) % COORD_KEY_SIZE or len(packed) // COORD_KEY_SIZE != self._count_memory_keys():
+            self._rebuild_coord_cache()
+            return
+        
+        self._fill_coord_cache([packed[i:i + COORD_KEY_SIZE] for i in range(0, len(packed), COORD_KEY_SIZE)], [])
+        self._coords_file = open(os.path.join(self.db_path, COORDS_FILE), 'ab')
+    
+    @_read_scoped
+    def _count_memory_keys(self):
+        """Number of memory records in the main database (O(1): B-tree stats)"""
+        txn = self._read_txn()
+        return txn.stat()['entries'] - sum(1 for key in NON_MEMORY_KEYS if txn.get(key) is not None)
+    
+    def _rebuild_coord_cache(self):
+        """
+        Load every coordinate key into the in-memory search matrix
+        
+        Keys only (no values) are read from LMDB, and coords.bin is
+        rewritten to match.
+        """
+        packed_keys = []
+        legacy_keys = []
+        with self.env.begin() as txn:
+            for coord_key in txn.cursor().iternext(keys=True, values=False):
+                if len(coord_key) == COORD_KEY_SIZE:
+                    packed_keys.append(coord_key)
+                elif coord_key != b'__stats__':
+                    legacy_keys.append(coord_key)
+        
+        self._fill_coord_cache(packed_keys, legacy_keys)
+        
+        if getattr(self, '_coords_file', None) is not None:
+            self._coords_file.close()
+        self._coords_file = open(os.path.join(self.db_path, COORDS_FILE), 'wb')
+        self._coords_file.write(b''.join(packed_keys))
+        self._coords_file.flush()
+    
+    def _fill_coord_cache(self, packed_keys, legacy_keys):
+        """
+        Build the search matrix from packed and legacy coordinate keys
+        
+        Packed keys are decoded in one vectorized pass. Row i of
+        _coord_matrix belongs to _coord_keys[i]. Rows hold the key's
+        quantized int16 values (coordinate * 1000): exact, and half the
+        bytes per distance sweep of float32.
+        """
+        self._coord_keys = []
+        self._coord_matrix = np.empty((max(1024, len(packed_keys) + len(legacy_keys)), 9), dtype=np.int16)
+        
+        if packed_keys:
+            quantized = np.frombuffer(b''.join(packed_keys), dtype='>u2').reshape(-1, 9)
+            self._coord_matrix[:len(packed_keys)] = quantized.astype(np.int32) - COORD_KEY_OFFSET
+            self._coord_keys.extend(packed_keys)
+        
+        for coord_key in legacy_keys:
+            try:
+                self._coord_matrix[len(self._coord_keys)] = self._decode_coordinate_quantized(coord_key)
+                self._coord_keys.append(coord_key)
+            except:
+                continue  # Sub-database names and corrupted keys
+        
+        self._coord_rows = {coord_key: row for row, coord_key in enumerate(self._coord_keys)}
+        self._kdtree = None  # (tree, rows covered), built lazily by _spatial_tree
+        self._kdtree_building = None  # Matrix being indexed by a background rebuild
+    
+    def _cache_coordinate_key(self, coord_key):
+        """Add a newly written coordinate key to the search matrix"""
+        if coord_key in self._coord_rows:
+            return  # Overwrite of an existing key: row already present
+        
+        row = len(self._coord_keys)
+        if row == len(self._coord_matrix):
+            # Amortized growth: double the preallocated capacity
+            grown = np.empty((2 * len(self._coord_matrix), 9), dtype=np.int16)
+            grown[:row] = self._coord_matrix
+            self._coord_matrix = grown
+        
+        self._coord_matrix[row] = self._decode_coordinate_quantized(coord_key)
+        self._coord_keys.append(coord_key)
+        self._coord_rows[coord_key] = row
+        if len(coord_key) == COORD_KEY_SIZE:
+            self._coords_file.write(coord_key)  # Flushed with stats
+    
+    def _open_text_index(self, rebuild=False):
+        """
+        Open the SQLite FTS5 trigram index behind search_semantic_content
+        
+        The trigram tokenizer indexes every 3-character window, so MATCH on
+        a quoted phrase is a case-insensitive substring search. If this
+        SQLite build lacks FTS5/trigram, searches fall back to a full scan.
+        
+        Args:
+            rebuild: Repopulate even if non-empty (rows newer than the last
+                     stats save were never committed)
+        """
+        self.text_index = None
+        # Shared across threads (background writers index text too);
+        # every use of the connection holds this lock
+        self._text_lock = threading.RLock()
+        try:
+            connection = sqlite3.connect(os.path.join(self.db_path, TEXT_INDEX_FILE), check_same_thread=False)
+            connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS memory_text "
+                "USING fts5(input, semantic, coord_key UNINDEXED, tokenize='trigram')"
+            )
+            connection.commit()
+        except sqlite3.Error:
+            return  # No FTS5 trigram support: scan fallback
+        
+        self.text_index = connection
+        indexed = connection.execute("SELECT count(*) FROM memory_text").fetchone()[0]
+        if rebuild or (not indexed and self.stats['total_memories']):
+            self._rebuild_text_index()
+    
+    def _rebuild_text_index(self):
+        """Repopulate the text index from every record in the main database"""
+        if self.text_index is None:
+            return
+        
+        with self._text_lock:
+            self.text_index.execute("DELETE FROM memory_text")
+            # Zero-copy values: each one is decoded (and its key copied by SQLite) in place
+            with self.env.begin(buffers=True) as txn:
+                for coord_key, memory_value in txn.cursor():
+                    if coord_key in NON_MEMORY_KEYS:
+                        continue
+                    memory_data = self._decode_value(memory_value)
+                    if isinstance(memory_data, dict) and 'id' in memory_data:
+                        self._index_memory_text([(coord_key, memory_data)])
+            self.text_index.commit()
+    
+    def _index_memory_text(self, records):
+        """Queue (coord_key, record) pairs for the text index; committed with stats"""
+        if self.text_index is not None:
+            with self._text_lock:
+                self.text_index.executemany(
+                    "INSERT INTO memory_text (input, semantic, coord_key) VALUES (?, ?, ?)",
+                    [(record.get('input', ''), record.get('semantic', ''), coord_key) for coord_key, record in records]
+                )
+    
+    def _backfill_id_index(self):
+        """Build the id index for databases written before it existed"""
+        with self.env.begin(write=True) as txn:
+            if txn.stat(self.id_db)['entries'] or not self.stats['total_memories']:
+                return
+            
+            for coord_key, memory_value in txn.cursor():
+                if coord_key in NON_MEMORY_KEYS:
+                    continue
+                memory_data = self._decode_value(memory_value)
+                if isinstance(memory_data, dict) and isinstance(memory_data.get('id'), int):
+                    txn.put(ID_KEY_STRUCT.pack(memory_data['id']), coord_key, db=self.id_db)
+    
+    def _backfill_search_index(self):
+        """Build the search text and text hash indexes for databases written before them"""
+        with self.env.begin(write=True) as txn:
+            fill_search = not txn.stat(self.search_db)['entries']
+            fill_hash = not txn.stat(self.hash_db)['entries']
+            if not (fill_search or fill_hash) or not self.stats['total_memories']:
+                return
+            
+            for coord_key, memory_value in txn.cursor():
+                if coord_key in NON_MEMORY_KEYS:
+                    continue
+                memory_data = self._decode_value(memory_value)
+                if not isinstance(memory_data, dict):
+                    continue
+                if fill_search:
+                    txn.put(coord_key, self._search_text(memory_data), db=self.search_db)
+                if fill_hash and isinstance(memory_data.get('id'), int):
+                    txn.put(self._text_hash(memory_data.get('input', '')),
+                            ID_KEY_STRUCT.pack(memory_data['id']), db=self.hash_db)
+    
+    @staticmethod
+    def _search_text(memory_data):
+        """Lowercased input and semantic text, as stored in search_db"""
+        return (memory_data.get('input', '') + '\0' + memory_data.get('semantic', '')).lower().encode('utf-8')
+    
+    @staticmethod
+    def _text_hash(input_text):
+        """128-bit blake2b digest of a memory's input text (hash_db key)"""
+        return hashlib.blake2b(input_text.encode('utf-8'), digest_size=16).digest()
+    
+    def _recover_stats(self):
+        """
+        Catch stats up with records committed after the last stats save
+        
+        Stats are written back every STATS_FLUSH_INTERVAL puts, so after a
+        crash the stored count can lag the data - and the count hands out
+        new ids. Every record has an id_index entry, so that sub-database's
+        (O(1)) entry count is a floor for total_memories.
+        
+        Returns:
+            True if stats were behind the data
+        """
+        with self.env.begin() as txn:
+            indexed_ids = txn.stat(self.id_db)['entries']
+        
+        if indexed_ids <= self.stats['total_memories']:
+            return False
+        
+        print(f"🔄 Recovered {indexed_ids - self.stats['total_memories']} memories written after the last stats save")
+        self.stats['total_memories'] = indexed_ids
+        return True
     
     def _create_coordinate_key(self, coordinates):
         """
-        Create a simple coordinate key like DBManager.py
-        Uses JSON encoding of coordinate values for exact lookups
+        Create a packed 18-byte coordinate key for exact lookups
+        
+        Each axis is quantized to 3 decimal places (the old JSON key
+        precision) and stored as an offset uint16, so equal coordinates
+        always produce identical keys.
+        
+        Args:
+            coordinates: 9D coordinate dictionary or (9,) vector in AXES order
         """
-        # Extract coordinate values in consistent order
-        axes = ['x', 'y', 'z', 'a', 'b', 'c', 'd', 'e', 'f']
+        if isinstance(coordinates, dict):
+            coordinates = [coordinates.get(axis, 0.0) for axis in AXES]
+        elif isinstance(coordinates, np.ndarray):
+            coordinates = coordinates.tolist()
+        
         coord_values = []
         
-        for axis in axes:
-            if axis in coordinates:
-                # Round to 3 decimal places for consistent keys
-                coord_values.append(round(float(coordinates[axis]), 3))
-            else:
-                coord_values.append(0.0)
+        for value in coordinates:
+            # round(v, 3) first: identical quantization to the legacy JSON keys
+            # (np.round differs from round() on some 4-decimal inputs)
+            quantized = int(round(round(float(value), 3) * COORD_KEY_SCALE)) + COORD_KEY_OFFSET
+            coord_values.append(min(65535, max(0, quantized)))
         
-        # Create JSON key like DBManager.py
-        coord_key = json.dumps(coord_values)
-        return coord_key.encode()
+        return COORD_KEY_STRUCT.pack(*coord_values)
     
     def _decode_coordinate_key(self, coord_key_bytes):
-        """Decode coordinate key back to dictionary"""
-        coord_values = json.loads(coord_key_bytes.decode())
-        axes = ['x', 'y', 'z', 'a', 'b', 'c', 'd', 'e', 'f']
+        """Decode coordinate key back to dictionary (packed or legacy JSON)"""
+        if len(coord_key_bytes) == COORD_KEY_SIZE:
+            coord_values = COORD_KEY_STRUCT.unpack(coord_key_bytes)
+            return {axis: (value - COORD_KEY_OFFSET) / COORD_KEY_SCALE
+                    for axis, value in zip(AXES, coord_values)}
+        
+        # Legacy JSON key written before the packed format
+        coord_values = json.loads(bytes(coord_key_bytes).decode())
         
         coordinates = {}
-        for i, axis in enumerate(axes):
+        for i, axis in enumerate(AXES):
             coordinates[axis] = coord_values[i] if i < len(coord_values) else 0.0
         
         return coordinates
     
+    def _decode_coordinate_vec(self, coord_key_bytes):
+        """Decode coordinate key straight to a float32 (9,) vector"""
+        if len(coord_key_bytes) == COORD_KEY_SIZE:
+            quantized = np.frombuffer(coord_key_bytes, dtype='>u2')
+            return (quantized.astype(np.float32) - COORD_KEY_OFFSET) / COORD_KEY_SCALE
+        return coords_to_vec(self._decode_coordinate_key(coord_key_bytes))
+    
+    def _decode_coordinate_quantized(self, coord_key_bytes):
+        """Decode coordinate key to its int16 (9,) search-matrix row (coordinate * 1000)"""
+        if len(coord_key_bytes) == COORD_KEY_SIZE:
+            return (np.frombuffer(coord_key_bytes, dtype='>u2').astype(np.int32) - COORD_KEY_OFFSET).astype(np.int16)
+        quantized = np.rint(self._decode_coordinate_vec(coord_key_bytes) * COORD_KEY_SCALE)
+        return np.clip(quantized, -32768, 32767).astype(np.int16)
+    
     def store_memory_engram(self, memory_data):
         """
         Store memory using COORDINATE KEY approach - Simple and clean!
@@ -112,9 +547,249 @@ class EnhancedDBManager:
         Args:
             memory_data: Dict containing input, semantic, coordinates, id, etc.
         """
+        if self._write_queue is not None:
+            return self._enqueue_write([memory_data])[0]
+        
+        with self.env.begin(write=True) as txn:
+            memory_id = self.store_memory_engram_in_txn(txn, memory_data)
+            self._maybe_save_stats(txn)
+        self._invalidate_reads()
+        
+        return memory_id
+    
+    def store_memory_engram_in_txn(self, txn, memory_data, coord_key=None):
+        """
+        Store memory inside a caller-owned write transaction
+        
+        Bulk loaders keep one transaction open across many puts so the commit
+        cost is paid once per batch. The caller is responsible for persisting
+        stats (via _maybe_save_stats or _save_stats) before committing.
+        
+        Args:
+            txn: Open LMDB write transaction
+            memory_data: Dict containing input, semantic, coordinates, id, etc.
+            coord_key: Precomputed _create_coordinate_key() bytes, if the caller has them
+        """
+        coord_key, sanitized_memory_data = self._prepare_memory_record(memory_data, coord_key)
+        semantic_links = sanitized_memory_data.pop('semantic_links', None)
+        
+        # Store directly with coordinate key - SIMPLE!
+        memory_value = self._encode_value(sanitized_memory_data)
+        txn.put(coord_key, memory_value)
+        self._put_links(txn, coord_key, semantic_links)
+        for db_name, key, value in self._side_entries(coord_key, sanitized_memory_data):
+            db = getattr(self, db_name)
+            # Ids only grow, so id_db rows append to the rightmost page (no
+            # B-tree descent); a reused id falls back to an ordinary put
+            if db is not self.id_db or not txn.put(key, value, db=db, append=True):
+                txn.put(key, value, db=db)
+        self._cache_coordinate_key(coord_key)
+        self._index_memory_text([(coord_key, sanitized_memory_data)])
+        
+        # Update stats
+        self.stats['total_memories'] += 1
+        self._dirty_puts += 1
+        
+        return sanitized_memory_data['id']
+    
+    def store_many(self, items):
+        """
+        Store a batch of memories in a single write transaction
+        
+        Args:
+            items: List of memory_data dicts (same shape as store_memory_engram)
+            
+        Returns:
+            List of stored memory IDs, in input order
+        """
+        if self._write_queue is not None:
+            return self._enqueue_write(items)
+        
+        with self.env.begin(write=True) as txn:
+            memory_ids = self.store_many_in_txn(txn, items)
+            self._maybe_save_stats(txn)
+        self._invalidate_reads()
+        
+        return memory_ids
+    
+    def store_many_in_txn(self, txn, items):
+        """
+        Store a batch of memories inside a caller-owned write transaction
+        
+        Records are presorted by key and written with putmulti, so LMDB
+        fills pages sequentially instead of hopping around the B-tree.
+        Duplicate coordinates keep last-write-wins semantics (stable sort).
+        """
+        records, side_entries, links_by_key, memory_ids = self._stage_records(items)
+        self._put_staged(txn, records, side_entries, links_by_key)
+        return memory_ids
+    
+    def _stage_records(self, items):
+        """
+        Prepare a batch for writing: assign IDs, encode values, update stats
+        and the in-memory coordinate/text indexes
+        
+        Returns:
+            (records, side_entries, links_by_key, memory_ids) - records and
+            per-sub-database entry lists presorted by key, ready for _put_staged
+        """
+        records = []
+        side_entries = {}
+        text_entries = []
+        links_by_key = {}
+        memory_ids = []
+        
+        for memory_data in items:
+            coord_key, sanitized_memory_data = self._prepare_memory_record(memory_data)
+            links_by_key[coord_key] = sanitized_memory_data.pop('semantic_links', None)
+            memory_id = sanitized_memory_data['id']
+            records.append((coord_key, self._encode_value(sanitized_memory_data)))
+            text_entries.append((coord_key, sanitized_memory_data))
+            for db_name, key, value in self._side_entries(coord_key, sanitized_memory_data):
+                side_entries.setdefault(db_name, []).append((key, value))
+            memory_ids.append(memory_id)
+            self.stats['total_memories'] += 1
+            self._dirty_puts += 1
+        
+        records.sort(key=lambda record: record[0])
+        for entries in side_entries.values():
+            entries.sort(key=lambda entry: entry[0])
+        for coord_key, _ in records:
+            self._cache_coordinate_key(coord_key)
+        self._index_memory_text(text_entries)
+        
+        return records, side_entries, links_by_key, memory_ids
+    
+    def _side_entries(self, coord_key, memory_data):
+        """(sub-database attribute, key, value) rows written alongside every record"""
+        id_bytes = ID_KEY_STRUCT.pack(memory_data['id'])
+        return (
+            ('id_db', id_bytes, coord_key),
+            ('search_db', coord_key, self._search_text(memory_data)),
+            ('hash_db', self._text_hash(memory_data.get('input', '')), id_bytes),
+        )
+    
+    def _put_staged(self, txn, records, side_entries, links_by_key):
+        """Write staged records, sub-database entries and links (all presorted)"""
+        txn.cursor().putmulti(records)
+        for db_name, entries in side_entries.items():
+            cursor = txn.cursor(db=getattr(self, db_name))
+            # Sequential ids append (see store_memory_engram_in_txn); any
+            # entry that could not be appended is rewritten normally
+            if db_name == 'id_db' and cursor.putmulti(entries, append=True)[1] == len(entries):
+                continue
+            cursor.putmulti(entries)
+        for coord_key in sorted(links_by_key):
+            self._put_links(txn, coord_key, links_by_key[coord_key])
+    
+    def _enqueue_write(self, items):
+        """Stage items on the caller's thread and hand them to the writer"""
+        self._raise_write_error()
+        records, side_entries, links_by_key, memory_ids = self._stage_records(items)
+        self._write_queue.put((records, side_entries, links_by_key))
+        if self._dirty_puts >= STATS_FLUSH_INTERVAL:
+            self.flush()
+            with self.env.begin(write=True) as txn:
+                self._save_stats(txn)
+            self._invalidate_reads()
+        return memory_ids
+    
+    def _writer_loop(self):
+        """
+        Background writer: drain up to WRITE_BATCH_SIZE queued records and
+        commit them in one transaction. A None item stops the thread.
+        """
+        while True:
+            batches = [self._write_queue.get()]
+            pending = len(batches[0][0]) if batches[0] is not None else 0
+            while batches[-1] is not None and pending < WRITE_BATCH_SIZE:
+                try:
+                    batch = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                batches.append(batch)
+                if batch is not None:
+                    pending += len(batch[0])
+            
+            staged = [batch for batch in batches if batch is not None]
+            try:
+                if staged:
+                    records = []
+                    side_entries = {}
+                    links_by_key = {}
+                    for batch_records, batch_side, batch_links in staged:
+                        records.extend(batch_records)
+                        for db_name, entries in batch_side.items():
+                            side_entries.setdefault(db_name, []).extend(entries)
+                        links_by_key.update(batch_links)
+                    # Stable sort keeps queue order for duplicate keys
+                    records.sort(key=lambda record: record[0])
+                    for entries in side_entries.values():
+                        entries.sort(key=lambda entry: entry[0])
+                    with self.env.begin(write=True) as txn:
+                        self._put_staged(txn, records, side_entries, links_by_key)
+                    self._invalidate_reads()
+            except Exception as e:
+                lost = sum(len(b[0]) for b in staged)
+                print(f"❌ Background write failed ({lost} memories lost): {e}")
+                # Their ids were already handed out: surface the loss to callers
+                with self._write_error_lock:
+                    if self._write_error is None:
+                        self._write_error = (lost, e)
+                    else:
+                        self._write_error = (self._write_error[0] + lost, self._write_error[1])
+            finally:
+                for _ in batches:
+                    self._write_queue.task_done()
+            
+            if batches[-1] is None:
+                return
+    
+    def flush(self):
+        """
+        Block until every queued background write has been committed
+        
+        Raises:
+            RuntimeError: A background commit failed, so memories whose ids
+                were already returned are not stored
+        """
+        if self._write_queue is not None:
+            self._write_queue.join()
+        self._raise_write_error()
+    
+    def _raise_write_error(self):
+        """Raise (once) for background commits that failed since the last check"""
+        with self._write_error_lock:
+            write_error, self._write_error = self._write_error, None
+        if write_error is not None:
+            lost, error = write_error
+            raise RuntimeError(f"Background write failed: {lost} acknowledged memories were lost") from error
+    
+    def _put_links(self, txn, coord_key, semantic_links):
+        """Store a record's semantic links, or clear those of a previous occupant"""
+        if semantic_links is None:
+            txn.delete(coord_key, db=self.links_db)
+        else:
+            txn.put(coord_key, self._encode_value(semantic_links), db=self.links_db)
+    
+    def _decode_record(self, txn, coord_key, memory_value):
+        """Decode a stored record and attach its semantic links (None if damaged)"""
+        memory_data = self._decode_value(memory_value)
+        if memory_data is None:
+            return None
+        links_value = txn.get(coord_key, db=self.links_db)
+        if links_value is not None:
+            semantic_links = self._decode_value(links_value)
+            if semantic_links is not None:
+                memory_data['semantic_links'] = semantic_links
+        return memory_data
+    
+    def _prepare_memory_record(self, memory_data, coord_key=None):
+        """Sanitize memory_data into its stored form; returns (coord_key, record)"""
         # Get coordinates and create key
         coordinates = memory_data['coordinates']
-        coord_key = self._create_coordinate_key(coordinates)
+        if coord_key is None:
+            coord_key = self._create_coordinate_key(coordinates)
         
         # NUCLEAR SANITIZATION - Convert everything to safe types
         sanitized_memory_data = {
@@ -132,18 +807,9 @@ class EnhancedDBManager:
         if 'semantic_links' in memory_data:
             sanitized_memory_data['semantic_links'] = memory_data['semantic_links']
         
-        # Store directly with coordinate key - SIMPLE!
-        with self.env.begin(write=True) as txn:
-            memory_value = pickle.dumps(sanitized_memory_data)
-            txn.put(coord_key, memory_value)
-            
-            # Update stats
-            self.stats['total_memories'] += 1
-            self._save_stats(txn)
-        
-        return sanitized_memory_data['id']
+        return coord_key, sanitized_memory_data
     
-    def store_memory(self, input_text, semantic_summary, coordinates, metadata=None):
+    def store_memory(self, input_text, semantic_summary, coordinates, metadata=None, semantic_links=None):
         """
         Store a memory with the simplified interface
         
@@ -152,10 +818,31 @@ class EnhancedDBManager:
             semantic_summary: Semantic summary of the text
             coordinates: 9D coordinate dictionary
             metadata: Optional metadata dictionary
+            semantic_links: Optional link structure, stored at the top level
             
         Returns:
             memory_id: The ID of the stored memory
         """
+        # Store using coordinate key
+        return self.store_memory_engram(
+            self._build_memory_data(input_text, semantic_summary, coordinates, metadata, semantic_links))
+    
+    def store_memory_in_txn(self, txn, input_text, semantic_summary, coordinates, metadata=None,
+                            semantic_links=None, coord_key=None):
+        """
+        Store a memory inside a caller-owned write transaction
+        
+        Same interface as store_memory(); see store_memory_engram_in_txn().
+        
+        Returns:
+            memory_id: The ID of the stored memory
+        """
+        return self.store_memory_engram_in_txn(
+            txn, self._build_memory_data(input_text, semantic_summary, coordinates, metadata, semantic_links),
+            coord_key)
+    
+    def _build_memory_data(self, input_text, semantic_summary, coordinates, metadata=None, semantic_links=None):
+        """Create the memory data structure with the next memory ID"""
         # Generate a new memory ID
         memory_id = self.stats['total_memories']
         
@@ -171,189 +858,372 @@ class EnhancedDBManager:
             'metadata': metadata or {}
         }
         
-        # Store using coordinate key
-        return self.store_memory_engram(memory_data)
+        if semantic_links is not None:
+            memory_data['semantic_links'] = semantic_links
+        
+        return memory_data
     
+    @_read_scoped
     def get_memory_by_coordinates(self, coordinates, tolerance=0.001):
         """
         Retrieve memory by coordinates - SIMPLE LOOKUP!
         
         Args:
-            coordinates: Dict with x,y,z,a,b,c,d,e,f values
+            coordinates: Dict with x,y,z,a,b,c,d,e,f values (or a (9,) vector)
             tolerance: Tolerance for approximate matching
         """
         # Try exact match first
         coord_key = self._create_coordinate_key(coordinates)
         
-        with self.env.begin() as txn:
-            memory_value = txn.get(coord_key)
-            
-            if memory_value:
-                self.stats['cache_hits'] += 1
-                return pickle.loads(memory_value)
-            
-            # If no exact match and tolerance > 0, try approximate
-            if tolerance > 0:
-                return self._find_approximate_match(coordinates, tolerance, txn)
+        txn = self._read_txn()
+        memory_value = txn.get(coord_key)
+        
+        if memory_value:
+            self.stats['cache_hits'] += 1
+            return self._decode_record(txn, coord_key, memory_value)
+        
+        # If no exact match and tolerance > 0, try approximate
+        if tolerance > 0:
+            return self._find_approximate_match(coordinates, tolerance)
         
         self.stats['cache_misses'] += 1
         return None
     
+    @_read_scoped
+    def get_memory_id_by_text(self, input_text):
+        """
+        ID of the stored memory whose input text is exactly input_text
+        
+        Returns:
+            int memory ID, or None if no such memory is stored
+        """
+        memory_data = self.get_memory_by_text(input_text)
+        return memory_data['id'] if memory_data is not None else None
+    
+    @_read_scoped
+    def get_memory_by_text(self, input_text):
+        """
+        Stored memory whose input text is exactly input_text
+        
+        One hash_db lookup, confirmed against the record (a later memory
+        at the same coordinates may have replaced it).
+        
+        Returns:
+            Memory data dict, or None if no such memory is stored
+        """
+        id_bytes = self._read_txn().get(self._text_hash(input_text), db=self.hash_db)
+        if id_bytes is None:
+            return None
+        
+        memory_data = self.get_memory_by_id(ID_KEY_STRUCT.unpack(id_bytes)[0])
+        if memory_data is None or memory_data.get('input') != input_text:
+            return None
+        return memory_data
+    
+    @_read_scoped
     def get_memory_by_id(self, memory_id):
         """
-        Retrieve memory by ID - scan through all memories
-        (Less efficient but sometimes needed)
+        Retrieve memory by ID via the id -> coordinate key index
+        
+        Two B-tree lookups and a single decode. If a later memory with
+        identical coordinates overwrote the record, the stale index entry
+        no longer matches and the lookup misses.
         """
-        with self.env.begin() as txn:
-            cursor = txn.cursor()
+        try:
+            id_key = ID_KEY_STRUCT.pack(memory_id)
+        except struct.error:
+            id_key = None  # Not a valid memory id
+        
+        if id_key is not None:
+            txn = self._read_txn()
+            coord_key = txn.get(id_key, db=self.id_db)
+            memory_value = txn.get(coord_key) if coord_key else None
             
-            for coord_key, memory_value in cursor:
-                try:
-                    memory_data = pickle.loads(memory_value)
-                    if memory_data.get('id') == memory_id:
-                        self.stats['cache_hits'] += 1
-                        return memory_data
-                except:
-                    continue  # Skip corrupted entries
+            if memory_value:
+                memory_data = self._decode_record(txn, coord_key, memory_value)
+                if memory_data is not None and memory_data.get('id') == memory_id:
+                    self.stats['cache_hits'] += 1
+                    return memory_data
         
         self.stats['cache_misses'] += 1
         return None
     
+    @_read_scoped
     def find_memories_in_region(self, center_coords, radius=1.0, max_results=50):
         """
-        Find memories within a radius - Simple distance calculation
+        Find memories within a radius - KD-tree or vectorized matrix sweep
         
         Args:
             center_coords: Center coordinates for search
             radius: Search radius in 9D space
-            max_results: Maximum number of results to return
+            max_results: Maximum number of results to return (closest first)
         """
-        found_memories = []
+        rows, distances_sq = self._region_rows(self._quantized_query(center_coords), radius * COORD_KEY_SCALE)
+        return self._load_ranked_rows(rows, distances_sq, max_results)
+    
+    @_read_scoped
+    def find_memories_in_regions(self, center_coords_list, radius=1.0, max_results=50):
+        """
+        find_memories_in_region for many centers at once
         
-        with self.env.begin() as txn:
-            cursor = txn.cursor()
-            
-            for coord_key, memory_value in cursor:
-                try:
-                    # Decode coordinates from key
-                    coords = self._decode_coordinate_key(coord_key)
-                    
-                    # Calculate distance
-                    distance = self._calculate_distance(center_coords, coords)
-                    
-                    if distance <= radius:
-                        memory_data = pickle.loads(memory_value)
-                        found_memories.append({
-                            'memory': memory_data,
-                            'distance': distance,
-                            'coordinates': coords
-                        })
-        
-                        if len(found_memories) >= max_results:
-                            break
-                            
-                except:
-                    continue  # Skip corrupted entries
+        Without a KD-tree, one (Q, N) sweep over the coordinate matrix scores
+        every center, instead of Q separate sweeps.
         
-        # Sort by distance
-        found_memories.sort(key=lambda x: x['distance'])
-        return found_memories
+        Returns:
+            One result list per center, in input order
+        """
+        if not center_coords_list:
+            return []
+        
+        scaled_radius = radius * COORD_KEY_SCALE
+        query_vecs = [self._quantized_query(center_coords) for center_coords in center_coords_list]
+        
+        if self._spatial_tree() is not None:
+            return [self._load_ranked_rows(*self._region_rows(query_vec, scaled_radius), max_results)
+                    for query_vec in query_vecs]
+        
+        all_distances_sq = squared_distances_many(self._coord_matrix[:len(self._coord_keys)],
+                                                   np.stack(query_vecs))
+        results = []
+        for distances_sq in all_distances_sq:
+            rows = np.flatnonzero(distances_sq <= scaled_radius * scaled_radius)
+            results.append(self._load_ranked_rows(rows, distances_sq[rows], max_results))
+        return results
     
+    def _region_rows(self, query_vec, scaled_radius):
+        """Cached rows within scaled_radius of a _quantized_query vector, with squared distances"""
+        tree_info = self._spatial_tree()
+        
+        if tree_info is None:
+            return scan_radius(self._coord_matrix[:len(self._coord_keys)],
+                               query_vec, scaled_radius * scaled_radius)
+        
+        # Slightly widened tree query; the float32 check below is exact
+        tree, tree_rows = tree_info
+        rows = np.concatenate((
+            np.asarray(tree.query_ball_point(query_vec, scaled_radius * (1 + 1e-6) + 1e-3), dtype=np.intp),
+            np.arange(tree_rows, len(self._coord_keys))
+        ))
+        rows.sort()
+        
+        distances_sq = self._coord_distances_sq(query_vec, rows)
+        hits = np.flatnonzero(distances_sq <= scaled_radius * scaled_radius)
+        return rows[hits], distances_sq[hits]
+    
+    @_read_scoped
     def find_nearest_memories(self, query_coords, k=10):
         """
-        Find k nearest memories - Simple brute force approach
+        Find k nearest memories - KD-tree or brute force over the coordinate matrix
         
         Args:
             query_coords: Query coordinates
             k: Number of nearest neighbors to find
         """
-        all_distances = []
+        query_vec = self._quantized_query(query_coords)
+        tree_info = self._spatial_tree()
         
-        with self.env.begin() as txn:
-            cursor = txn.cursor()
+        if tree_info is None or k <= 0:
+            return self._load_ranked_rows(np.arange(len(self._coord_keys)),
+                                          self._coord_distances_sq(query_vec), k)
+        
+        # Tree candidates plus rows not yet in the tree, re-ranked exactly
+        tree, tree_rows = tree_info
+        _, tree_hits = tree.query(query_vec, k=min(k, tree_rows))
+        rows = np.concatenate((
+            np.atleast_1d(tree_hits).astype(np.intp),
+            np.arange(tree_rows, len(self._coord_keys))
+        ))
+        rows.sort()
+        
+        return self._load_ranked_rows(rows, self._coord_distances_sq(query_vec, rows), k)
+    
+    def _spatial_tree(self):
+        """
+        KD-tree over the coordinate matrix, or None to use the brute-force sweep
+        
+        Rebuilt once more than KDTREE_REBUILD_FRACTION of the rows were
+        added after the last build; queries brute-force those newer rows.
+        Only the first build blocks: rebuilds run on a background thread
+        (cKDTree construction releases the GIL) while queries keep using
+        the previous tree plus the brute-forced tail.
+        """
+        row_count = len(self._coord_keys)
+        if not HAS_SCIPY or row_count < KDTREE_MIN_ROWS:
+            return None
+        
+        tree_info = self._kdtree
+        if tree_info is None:
+            tree_info = self._kdtree = (cKDTree(self._coord_matrix[:row_count]), row_count)
+        elif row_count - tree_info[1] > tree_info[1] * KDTREE_REBUILD_FRACTION and self._kdtree_building is None:
+            # Rows are append-only, so this prefix stays valid while indexed
+            matrix = self._kdtree_building = self._coord_matrix[:row_count]
+            threading.Thread(target=self._rebuild_spatial_tree, args=(matrix,), daemon=True).start()
+        return tree_info
+    
+    def _rebuild_spatial_tree(self, matrix):
+        """Background KD-tree build over a matrix prefix (see _spatial_tree)"""
+        try:
+            tree = cKDTree(matrix)
+            # Discard the result if the coordinate cache was reloaded meanwhile
+            if self._kdtree_building is matrix:
+                self._kdtree = (tree, len(matrix))
+        except Exception as e:
+            print(f"⚠️ KD-tree rebuild failed: {e}")
+        finally:
+            if self._kdtree_building is matrix:
+                self._kdtree_building = None
+    
+    def _quantized_query(self, query_coords):
+        """Query coordinates scaled into the search matrix's units (float32, unrounded)"""
+        return coords_to_vec(query_coords) * np.float32(COORD_KEY_SCALE)
+    
+    def _coord_distances_sq(self, query_vec, rows=None):
+        """
+        Squared distances from a _quantized_query vector to the given
+        (default: all) cached rows, in quantized units (1/COORD_KEY_SCALE)
+        """
+        if rows is None:
+            return squared_distances(self._coord_matrix[:len(self._coord_keys)], query_vec)
+        return squared_distances(self._coord_matrix[rows], query_vec)
+    
+    def _load_ranked_rows(self, rows, distances_sq, limit):
+        """
+        Decode the `limit` closest of the candidate rows, closest first
+        
+        distances_sq[i] belongs to rows[i]. Only the winners are read from
+        LMDB and deserialized. Selection is O(N) (see top_k_order) and ties
+        at the cut-off keep the earliest candidates.
+        """
+        order = top_k_order(distances_sq, limit)
+        rows, distances_sq = rows[order], distances_sq[order]
+        # Winners' coordinates straight from the SoA matrix, one vectorized divide
+        winner_coords = self._coord_matrix[rows] / COORD_KEY_SCALE
+        
+        found_memories = []
+        txn = self._read_txn()
+        for row, distance_sq, coords_row in zip(rows, distances_sq, winner_coords):
+            coord_key = self._coord_keys[row]
+            memory_value = txn.get(coord_key)
+            if memory_value is None:
+                continue  # Key from an aborted write
             
-            for coord_key, memory_value in cursor:
-                try:
-                    # Decode coordinates from key
-                    coords = self._decode_coordinate_key(coord_key)
-                    
-                    # Calculate distance
-                    distance = self._calculate_distance(query_coords, coords)
-                    memory_data = pickle.loads(memory_value)
-                    
-                    all_distances.append({
-                        'memory': memory_data,
-                        'distance': distance,
-                        'coordinates': coords
-                    })
-                    
-                except:
-                    continue  # Skip corrupted entries
+            memory_data = self._decode_record(txn, coord_key, memory_value)
+            if memory_data is None:
+                continue  # Skip corrupted entries
+            
+            found_memories.append({
+                'memory': memory_data,
+                'distance': math.sqrt(distance_sq) / COORD_KEY_SCALE,
+                'coordinates': (vec_to_coords(coords_row) if len(coord_key) == COORD_KEY_SIZE
+                                else self._decode_coordinate_key(coord_key))
+            })
         
-        # Sort by distance and return top k
-        all_distances.sort(key=lambda x: x['distance'])
-        return all_distances[:k]
+        return found_memories
     
+    @_read_scoped
     def search_semantic_content(self, query_text, max_results=20):
         """
         Search memories by semantic content
+        
+        Case-insensitive substring match on input text and semantic summary,
+        answered from the FTS5 trigram index. Queries shorter than one
+        trigram (or databases without the index) use the full scan.
         """
-        query_lower = query_text.lower()
+        query_bytes = query_text.lower().encode('utf-8')
+        if self.text_index is None or len(query_text) < 3:
+            return self._scan_semantic_content(query_bytes, max_results)
+        
+        phrase = '{input semantic}: "' + query_text.replace('"', '""') + '"'
         matching_memories = []
+        seen_keys = set()
         
-        with self.env.begin() as txn:
-            cursor = txn.cursor()
+        txn = self._read_txn()
+        with self._text_lock:
+            for (coord_key,) in self.text_index.execute(
+                    "SELECT coord_key FROM memory_text WHERE memory_text MATCH ? ORDER BY coord_key", (phrase,)):
+                if coord_key in seen_keys:
+                    continue
+                seen_keys.add(coord_key)
             
-            for coord_key, memory_value in cursor:
-                try:
-                    memory_data = pickle.loads(memory_value)
-                    
-                    # Check input text and semantic summary
-                    input_text = memory_data.get('input', '').lower()
-                    semantic_text = memory_data.get('semantic', '').lower()
-                    
-                    if (query_lower in input_text or query_lower in semantic_text):
-                        matching_memories.append(memory_data)
-                        
-                        if len(matching_memories) >= max_results:
-                            break
-                                
-                except:
+                # Re-check: the key may have been overwritten by other text
+                search_text = txn.get(coord_key, db=self.search_db)
+                if search_text is None or query_bytes not in bytes(search_text):
+                    continue  # Stale hit: the key now holds other text
+            
+                memory_value = txn.get(coord_key)
+                if memory_value is None:
+                    continue  # Key from an aborted write
+            
+                memory_data = self._decode_record(txn, coord_key, memory_value)
+                if memory_data is None:
                     continue  # Skip corrupted entries
+                matching_memories.append(memory_data)
+            
+                if len(matching_memories) >= max_results:
+                    break
         
         return matching_memories
     
+    def _scan_semantic_content(self, query_bytes, max_results):
+        """Full-scan substring search over search_db (fallback for search_semantic_content)"""
+        matching_memories = []
+        txn = self._read_txn()
+        
+        # Only hits decode the main record
+        for coord_key, search_text in txn.cursor(db=self.search_db):
+            if query_bytes not in bytes(search_text):
+                continue
+            
+            memory_value = txn.get(coord_key)
+            if memory_value is None:
+                continue  # Key from an aborted write
+            
+            memory_data = self._decode_record(txn, coord_key, memory_value)
+            if memory_data is None:
+                continue  # Skip corrupted entries
+            matching_memories.append(memory_data)
+            
+            if len(matching_memories) >= max_results:
+                break
+        
+        return matching_memories
+    
+    @_read_scoped
     def list_all_coordinate_keys(self):
         """
         List all coordinate keys in the database - like DBManager.py
         """
         keys = []
-        with self.env.begin() as txn:
-            cursor = txn.cursor()
-            for coord_key, _ in cursor:
-                try:
-                    coords = self._decode_coordinate_key(coord_key)
-                    keys.append(coords)
-                except:
-                    continue  # Skip corrupted keys
+        for coord_key in self._read_cursor().iternext(keys=True, values=False):
+            if coord_key in NON_MEMORY_KEYS:
+                continue
+            try:
+                coords = self._decode_coordinate_key(coord_key)
+                keys.append(coords)
+            except:
+                continue  # Skip corrupted keys
         return keys
     
+    @_read_scoped
     def get_memory_statistics(self):
-        """Get database statistics"""
-        memory_count = 0
+        """Get database statistics (constant time: B-tree metadata only)"""
+        txn = self._read_txn()
+        memory_count = self._count_memory_keys()
         
-        with self.env.begin() as txn:
-            cursor = txn.cursor()
-            memory_count = sum(1 for _ in cursor)
-            stat = txn.stat()
+        # Pages in use across the main database and its sub-databases
+        used_bytes = 0
+        for db in (None, self.id_db, self.links_db, self.search_db, self.hash_db):
+            stat = txn.stat(db) if db is not None else txn.stat()
+            used_bytes += stat['psize'] * (stat['branch_pages'] + stat['leaf_pages'] + stat['overflow_pages'])
             
         return {
             'total_memories': memory_count,
-            'database_size_mb': stat.get('ms_entries', 0) * stat.get('ms_psize', 1) / (1024 * 1024),
+            'database_size_mb': used_bytes / (1024 * 1024),
             'cache_hit_rate': self.stats['cache_hits'] / max(self.stats['cache_hits'] + self.stats['cache_misses'], 1),
             'last_access': self.stats['last_access_time']
         }
 
+    @_read_scoped
     def search_by_coordinates(self, query_coords, radius=1.0, max_results=50, 
                              search_strategy='radius'):
         """
@@ -403,6 +1273,56 @@ class EnhancedDBManager:
         else:
             raise ValueError(f"Unknown search strategy: {search_strategy}")
     
+    @_read_scoped
+    def search_by_coordinates_batch(self, query_coords_list, radius=1.0, max_results=50):
+        """
+        Radius search_by_coordinates for many queries in one batched sweep
+        
+        Returns:
+            One result list per query, in the search_by_coordinates format
+        """
+        return [
+            [
+                {
+                    'data': result['memory'],
+                    'distance': result['distance'],
+                    'coordinates': result['coordinates'],
+                    'search_type': 'radius_simple'
+                }
+                for result in raw_results
+            ]
+            for raw_results in self.find_memories_in_regions(query_coords_list, radius, max_results)
+        ]
+    
+    def _encode_value(self, value):
+        """Serialize a stored record: EMv1 header + msgpack (compact, no code execution)"""
+        payload = msgpack.packb(value, use_bin_type=True, default=_msgpack_default)
+        return RECORD_HEADER.pack(RECORD_MAGIC, zlib.crc32(payload)) + payload
+    
+    def _decode_value(self, value_bytes):
+        """
+        Deserialize a stored record, or return None if it is damaged
+        
+        Framed values are checked (magic + CRC32) before msgpack runs, so
+        corruption is rejected without raising. Unframed values predate
+        the header: pickle protocol 2+ always starts with the PROTO opcode
+        (0x80), which as a msgpack value would be a complete empty map, so
+        any longer value with that first byte is a legacy pickle; anything
+        else is bare msgpack.
+        """
+        if value_bytes[:4] == RECORD_MAGIC:
+            payload = value_bytes[RECORD_HEADER.size:]
+            if zlib.crc32(payload) != RECORD_HEADER.unpack_from(value_bytes)[1]:
+                return None
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        
+        try:
+            if value_bytes[:1] == b'\x80' and len(value_bytes) > 1:
+                return pickle.loads(value_bytes)
+            return msgpack.unpackb(value_bytes, raw=False, strict_map_key=False)
+        except Exception:
+            return None  # Damaged legacy value
+    
     def _sanitize_metadata(self, metadata):
         """Convert metadata to safe types"""
         if not metadata:
@@ -426,47 +1346,101 @@ class EnhancedDBManager:
         
         return sanitized
     
-    def _calculate_distance(self, coords1, coords2):
-        """Calculate 9D Euclidean distance"""
-        axes = ['x', 'y', 'z', 'a', 'b', 'c', 'd', 'e', 'f']
-        distance_squared = sum(
-            (coords1.get(axis, 0) - coords2.get(axis, 0)) ** 2 
-            for axis in axes
-        )
-        return math.sqrt(distance_squared)
-    
-    def _find_approximate_match(self, target_coords, tolerance, txn):
-        """Find memories with coordinates within tolerance"""
-        cursor = txn.cursor()
-        
-        for coord_key, memory_value in cursor:
-            try:
-                coords = self._decode_coordinate_key(coord_key)
-                distance = self._calculate_distance(target_coords, coords)
-                
-                if distance <= tolerance:
-                    return pickle.loads(memory_value)
-            except:
-                continue  # Skip corrupted entries
-        
-        return None
+    def _find_approximate_match(self, target_coords, tolerance):
+        """Find the nearest memory within tolerance (None if there is none)"""
+        rows, distances_sq = self._region_rows(self._quantized_query(target_coords), tolerance * COORD_KEY_SCALE)
+        nearest = self._load_ranked_rows(rows, distances_sq, 1)
+        return nearest[0]['memory'] if nearest else None
     
     def _load_stats(self):
         """Load stats from database"""
         try:
-            with self.env.begin() as txn:
+            with self.env.begin(buffers=True) as txn:
                 stats_value = txn.get(b'__stats__')
-                if stats_value:
-                    stored_stats = pickle.loads(stats_value)
+                stored_stats = self._decode_value(stats_value) if stats_value else None
+                if stored_stats:
                     self.stats.update(stored_stats)
         except:
             pass  # Use default stats
     
+    def _maybe_save_stats(self, txn):
+        """Write stats back once STATS_FLUSH_INTERVAL puts have accumulated"""
+        if self._dirty_puts >= STATS_FLUSH_INTERVAL:
+            self._save_stats(txn)
+    
     def _save_stats(self, txn):
-        """Save stats to database"""
+        """Save stats to database (and commit pending text index rows)"""
+        self._dirty_puts = 0
         self.stats['last_access_time'] = time.time()
-        stats_value = pickle.dumps(self.stats)
+        stats_value = self._encode_value(self.stats)
         txn.put(b'__stats__', stats_value)
+        self._coords_file.flush()
+        if self.text_index is not None:
+            with self._text_lock:
+                self.text_index.commit()
+    
+    def migrate_legacy_keys(self, batch_size=1000):
+        """
+        🔄 MIGRATE LEGACY KEYS - One-shot rewrite of JSON coordinate keys
+        
+        Databases written before the packed key format keep JSON-list keys
+        (and pickled values). This walks the main database once and rewrites
+        each legacy record under its packed key, re-encoding the value and
+        repointing its id_index entry. Safe to run repeatedly.
+        
+        Args:
+            batch_size: Records rewritten per write transaction
+            
+        Returns:
+            Number of migrated records
+        """
+        self.flush()
+        
+        # Collect legacy keys first so no cursor is open while rewriting
+        legacy_keys = []
+        with self.env.begin() as txn:
+            for coord_key in txn.cursor().iternext(keys=True, values=False):
+                if len(coord_key) == COORD_KEY_SIZE or coord_key in NON_MEMORY_KEYS:
+                    continue
+                try:
+                    self._decode_coordinate_key(coord_key)
+                    legacy_keys.append(coord_key)
+                except:
+                    continue  # Sub-database names and corrupted keys
+        
+        migrated = 0
+        for batch_start in range(0, len(legacy_keys), batch_size):
+            with self.env.begin(write=True) as txn:
+                for old_key in legacy_keys[batch_start:batch_start + batch_size]:
+                    memory_value = txn.get(old_key)
+                    if memory_value is None:
+                        continue
+                    
+                    memory_data = self._decode_value(memory_value)
+                    if memory_data is None:
+                        continue  # Leave damaged records where they are
+                    
+                    new_key = self._create_coordinate_key(self._decode_coordinate_key(old_key))
+                    txn.put(new_key, self._encode_value(memory_data))
+                    txn.delete(old_key)
+                    
+                    links_value = txn.pop(old_key, db=self.links_db)
+                    if links_value is not None:
+                        txn.put(new_key, links_value, db=self.links_db)
+                    txn.delete(old_key, db=self.search_db)
+                    if isinstance(memory_data, dict):
+                        txn.put(new_key, self._search_text(memory_data), db=self.search_db)
+                    
+                    if isinstance(memory_data, dict) and 'id' in memory_data:
+                        txn.put(ID_KEY_STRUCT.pack(memory_data['id']), new_key, db=self.id_db)
+                    migrated += 1
+            self._invalidate_reads()
+        
+        if migrated:
+            self._rebuild_coord_cache()
+            self._rebuild_text_index()
+            print(f"🔄 Migrated {migrated} memories to packed coordinate keys")
+        return migrated
     
     def switch_to_safe_mode(self):
         """
@@ -479,22 +1453,16 @@ class EnhancedDBManager:
             print("🛡️ Switching database to SAFE MODE...")
             
             # Save stats and close current environment
+            self.flush()
             with self.env.begin(write=True) as txn:
                 self._save_stats(txn)
+            self._invalidate_reads()
             self.env.sync()  # Force final sync
             self.env.close()
             
             # Reopen with safe settings
             self.turbo_mode = False
-            self.env = lmdb.open(
-                self.db_path, 
-                map_size=50 * 1024 * 1024 * 1024, 
-                writemap=True,
-                sync=True,         # SAFE: Enable sync for data durability
-                metasync=True,     # SAFE: Enable metadata sync
-                map_async=False,   # SAFE: Synchronous memory mapping
-                readahead=True     # SAFE: Enable readahead for sequential access
-            )
+            self._open_env()
             
             print("✅ Database switched to SAFE MODE - data durability enabled!")
         else:
@@ -510,21 +1478,15 @@ class EnhancedDBManager:
             print("🚀 Switching database to TURBO MODE...")
             
             # Save stats and close current environment
+            self.flush()
             with self.env.begin(write=True) as txn:
                 self._save_stats(txn)
+            self._invalidate_reads()
             self.env.close()
             
             # Reopen with turbo settings
             self.turbo_mode = True
-            self.env = lmdb.open(
-                self.db_path, 
-                map_size=50 * 1024 * 1024 * 1024, 
-                writemap=True,
-                sync=False,        # TURBO: Disable sync for bulk loading
-                metasync=False,    # TURBO: Disable metadata sync  
-                map_async=True,    # TURBO: Async memory mapping
-                readahead=False    # TURBO: Disable readahead for random access
-            )
+            self._open_env()
             
             print("✅ Database switched to TURBO MODE - maximum speed enabled!")
         else:
@@ -537,6 +1499,10 @@ class EnhancedDBManager:
         Use this periodically during bulk loading for safety checkpoints.
         """
         if hasattr(self, 'env') and self.env:
+            self.flush()
+            with self.env.begin(write=True) as txn:
+                self._save_stats(txn)
+            self._invalidate_reads()
             self.env.sync()
             print("💾 Database synced to disk")
     
@@ -549,10 +1515,21 @@ class EnhancedDBManager:
         }
 
     def close(self):
-        """Close the database"""
+        """Close the database (raises, after closing, if queued writes were lost)"""
+        if self._writer is not None:
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = self._write_queue = None
         with self.env.begin(write=True) as txn:
             self._save_stats(txn)
+        self._invalidate_reads()
         if self.turbo_mode:
             # Force final sync in TURBO mode before closing
             self.env.sync()
-        self.env.close() 
\ No newline at end of file
+        self.env.close()
+        self._coords_file.close()
+        if self.text_index is not None:
+            with self._text_lock:
+                self.text_index.close()
+                self.text_index = None
+        self._raise_write_error() 
\ No newline at end of file
@@ -27,6 +27,7 @@ from typing import Dict, List, Tuple, Optional
 from collections import Counter
 from enum import Enum
 from dataclasses import dataclass
+from SpatialKernels import AXES
 
 class SemanticDepth(Enum):
     """Processing depth levels for different use cases"""
@@ -152,6 +153,13 @@ class EnhancedSpatialValenceProcessor:
             }
         }
         
+        # Hash-varied axes: (coordinate name, median of its dimension map).
+        # The maps are fixed, so the medians are resolved once here.
+        self.hash_axis_midpoints = []
+        for dim, coord_name in zip(('r', 'c', 'a', 'u', 's', 'o', 'f'), ('y', 'z', 'a', 'b', 'c', 'd', 'f')):
+            values = sorted(self.enhanced_coord_maps[dim].values())
+            self.hash_axis_midpoints.append((coord_name, values[len(values) // 2]))
+        
         # PROCESSING CACHE
         self.analysis_cache = {}
         
@@ -164,6 +172,10 @@ class EnhancedSpatialValenceProcessor:
             'deep_analysis': 0
         }
     
+    def cache_key(self, text: str, context: Optional[str] = None) -> str:
+        """analysis_cache key for a (text, context) pair at this depth"""
+        return f"{text}:{self.depth.value}:{context or ''}"
+    
     def analyze_text(self, text: str, context: Optional[str] = None) -> Dict:
         """
         Enhanced text analysis with multiple semantic layers
@@ -171,7 +183,7 @@ class EnhancedSpatialValenceProcessor:
         start_time = time.time()
         
         # Check cache first
-        cache_key = f"{text}:{self.depth.value}:{context or ''}"
+        cache_key = self.cache_key(text, context)
         if cache_key in self.analysis_cache:
             self.stats['cache_hits'] += 1
             return self.analysis_cache[cache_key]
@@ -486,16 +498,9 @@ class EnhancedSpatialValenceProcessor:
         text = analysis['input_text']
         hash_bytes = hashlib.md5(text.encode()).digest()
         
-        dim_names = ['r', 'c', 'a', 'u', 's', 'o', 'f']
-        coord_names = ['y', 'z', 'a', 'b', 'c', 'd', 'f']
-        
-        for i, (dim, coord_name) in enumerate(zip(dim_names, coord_names)):
-            # Get middle value from enhanced maps
-            values = list(self.enhanced_coord_maps[dim].values())
-            middle_value = sorted(values)[len(values) // 2]
-            
+        for hash_byte, (coord_name, middle_value) in zip(hash_bytes, self.hash_axis_midpoints):
             # Add small hash-based offset for uniqueness
-            offset = (hash_bytes[i] / 255.0 - 0.5) * 0.1
+            offset = (hash_byte / 255.0 - 0.5) * 0.1
             coords[coord_name] = round(middle_value + offset, 4)
         
         # Add x coordinate (time also maps to x for 9D consistency)
@@ -506,7 +511,7 @@ class EnhancedSpatialValenceProcessor:
     def _format_coordinate_key(self, coords: Dict[str, float]) -> str:
         """Format coordinates into key string"""
         key_parts = []
-        for name in ['x', 'y', 'z', 'a', 'b', 'c', 'd', 'e', 'f']:
+        for name in AXES:
             value = coords.get(name, 0.0)
             key_parts.append(f"[{value:.3f}]")
         return ''.join(key_parts)
@@ -573,6 +578,16 @@ class EnhancedSpatialValenceToCoordGeneration:
             'enhanced_analysis': analysis  # Full enhanced analysis
         }
     
+    def process_batch(self, texts: List[str], context: Optional[str] = None) -> List[Dict]:
+        """
+        Process a batch of texts
+        
+        Bulk callers go through this entry point so the per-text analysis can
+        be swapped for a vectorized kernel without touching them.
+        """
+        process = self.process
+        return [process(text, context) for text in texts]
+    
     def _extract_semantic_keys(self, analysis: Dict) -> Dict[str, str]:
         """Extract semantic keys for backward compatibility"""
         temporal = analysis.get('temporal_info', {})
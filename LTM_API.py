@@ -19,7 +19,9 @@ License: MIT
 import os
 import sys
 import json
+import copy
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Optional, Union, Tuple, Any
 from datetime import datetime
 
@@ -28,6 +30,43 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from EngramManager import EngramManager
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Seconds an assembled get_system_statistics() result is served from cache
+STATS_CACHE_TTL = 0.5
+
+def _json_default(value):
+    """Fallback for values stdlib json can't encode (numpy scalars/arrays)"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def _stored_metadata(memory_data: Optional[Dict]) -> Optional[Dict]:
+    """Caller metadata as stored inside a memory record (None if none was stored)"""
+    storage_data = memory_data.get('metadata') if memory_data else None
+    return storage_data.get('metadata') if storage_data else None
+
+def serialize(result: Dict) -> bytes:
+    """
+    Serialize an API result dict to JSON bytes for HTTP, IPC or logs
+    
+    Uses orjson (numpy-aware, several times faster) when installed,
+    stdlib json otherwise.
+    
+    Args:
+        result: Dict returned by any LongTermMemory_API method
+        
+    Returns:
+        bytes: UTF-8 JSON document
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(result, default=_json_default).encode('utf-8')
+
 class LongTermMemory_API:
     """
     Long-Term Memory API
@@ -41,7 +80,8 @@ class LongTermMemory_API:
                  enable_linking: bool = True,
                  turbo_mode: bool = False,
                  max_size_gb: int = 50,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 encode_workers: Optional[int] = None):
         """
         Initialize the Long-Term Memory API
         
@@ -51,6 +91,8 @@ class LongTermMemory_API:
             turbo_mode: Use TURBO mode for bulk operations vs SAFE mode (default: False)
             max_size_gb: Maximum database size in GB (default: 50GB)
             verbose: Enable detailed logging (default: False)
+            encode_workers: Processes for bulk coordinate encoding (default: 1 = in-process;
+                see EngramManager for the fork / __main__ caveats of a pool)
         """
         self.version = "1.0.0"
         self.db_path = db_path
@@ -64,9 +106,25 @@ class LongTermMemory_API:
             db_path=db_path,
             enable_linking=enable_linking,
             turbo_mode=turbo_mode,
-            verbose=verbose
+            verbose=verbose,
+            max_size=max_size_gb * 1024 ** 3,
+            encode_workers=encode_workers
         )
         
+        # Background writer for the *_async stores: one thread, so
+        # queued batches commit in submission order (LMDB has one writer)
+        self._write_executor = None
+        self._pending_writes = []
+        
+        # Reader pool for search_similar_async: reads use per-thread LMDB
+        # snapshots, so concurrent searches never block each other (each
+        # task releases its snapshot, idle workers pin no pages)
+        self._read_executor = None
+        
+        # Short-lived cache for get_system_statistics (dashboards poll it)
+        self._stats_cache = None
+        self._stats_cache_time = 0.0
+        
         if verbose:
             print(f"Long-Term Memory API v{self.version} initialized")
             print(f"Database: {db_path}")
@@ -76,30 +134,51 @@ class LongTermMemory_API:
     
     def store_memory(self, 
                     text: str, 
-                    metadata: Optional[Dict] = None) -> Dict:
+                    metadata: Optional[Dict] = None,
+                    dedupe: bool = False) -> Dict:
         """
         Store a memory in the long-term spatial database
         
         Args:
             text: Text content to store
             metadata: Optional metadata dictionary
+            dedupe: Return the existing memory instead of storing an exact
+                duplicate of already stored text (its stored metadata is
+                kept; the metadata argument is then ignored)
             
         Returns:
-            Dict: Storage result with coordinate information
+            Dict: Storage result with coordinate information and the
+                metadata actually stored with the memory
         """
+        # Queued bulk writes go first: keeps ID order and a single writer
+        self.flush()
+        return self._store_memory(text, metadata, dedupe)
+    
+    def _store_memory(self, text: str, metadata: Optional[Dict], dedupe: bool) -> Dict:
+        """Store one memory; callers guarantee no queued write is still pending"""
+        timestamp = time.time()
+        db_manager = self._ltm.db_manager
         try:
-            memory_id = self._ltm.store_memory(text, metadata)
+            stored = db_manager.get_memory_by_text(text) if dedupe else None
+            deduped = stored is not None
+            if deduped:
+                memory_id = stored['id']
+            else:
+                memory_id = self._ltm.store_memory(text, metadata)
+                self._stats_cache = None  # Next statistics call sees this write
+                stored = db_manager.get_memory_by_id(memory_id) if memory_id is not None else None
             
             if memory_id is not None:
-                # Get the stored memory details
-                stats = self._ltm.get_system_stats()
+                # Counter + env header only: no per-write stats walk
+                stats = self._ltm.get_cheap_stats()
                 
                 return {
                     "success": True,
                     "memory_id": memory_id,
                     "text": text,
-                    "metadata": metadata,
-                    "timestamp": time.time(),
+                    "metadata": _stored_metadata(stored),
+                    "deduped": deduped,
+                    "timestamp": timestamp,
                     "total_memories": stats['database_memories'],
                     "database_size_mb": stats['database_size_mb']
                 }
@@ -107,14 +186,14 @@ class LongTermMemory_API:
                 return {
                     "success": False,
                     "error": "Failed to store memory",
-                    "timestamp": time.time()
+                    "timestamp": timestamp
                 }
                 
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
-                "timestamp": time.time()
+                "timestamp": timestamp
             }
     
     def search_similar(self, 
@@ -132,6 +211,7 @@ class LongTermMemory_API:
         Returns:
             Dict: Search results with similarity scores
         """
+        timestamp = time.time()
         try:
             results = self._ltm.search_similar(query_text, max_results)
             
@@ -153,7 +233,7 @@ class LongTermMemory_API:
                 "query": query_text,
                 "results": formatted_results,
                 "total_found": len(formatted_results),
-                "search_timestamp": time.time()
+                "search_timestamp": timestamp
             }
             
         except Exception as e:
@@ -161,21 +241,33 @@ class LongTermMemory_API:
                 "success": False,
                 "error": str(e),
                 "query": query_text,
-                "search_timestamp": time.time()
+                "search_timestamp": timestamp
             }
     
-    def get_system_statistics(self) -> Dict:
+    def get_system_statistics(self, force: bool = False) -> Dict:
         """
         Get comprehensive system statistics and performance metrics
         
+        Results are reused for STATS_CACHE_TTL seconds so frequent polling
+        doesn't recompute them on every call.
+        
+        Args:
+            force: Bypass the cache and recompute now
+            
         Returns:
             Dict: System statistics and health information
         """
+        now = time.monotonic()
+        cached = self._stats_cache
+        if not force and cached is not None and now - self._stats_cache_time < STATS_CACHE_TTL:
+            return copy.deepcopy(cached)  # Callers may mutate their reply
+        
+        timestamp = time.time()
         try:
             stats = self._ltm.get_system_stats()
             mode_info = self._ltm.get_mode_info()
             
-            return {
+            result = {
                 "success": True,
                 "version": self.version,
                 "database": {
@@ -200,14 +292,18 @@ class LongTermMemory_API:
                     "turbo_enabled": mode_info.get('turbo_mode', False),
                     "linking_enabled": mode_info['linking_enabled']
                 },
-                "timestamp": time.time()
+                "timestamp": timestamp
             }
             
+            self._stats_cache = copy.deepcopy(result)
+            self._stats_cache_time = now
+            return result
+            
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
-                "timestamp": time.time()
+                "timestamp": timestamp
             }
     
     def bulk_store_memories(self, 
@@ -216,6 +312,9 @@ class LongTermMemory_API:
         """
         Store multiple memories efficiently in bulk
         
+        Delegates to bulk_store_memories_fast; progress is reported per
+        committed batch rather than every 10 items.
+        
         Args:
             text_list: List of text strings to store
             show_progress: Show progress during bulk storage
@@ -223,24 +322,56 @@ class LongTermMemory_API:
         Returns:
             Dict: Bulk storage results and statistics
         """
+        return self.bulk_store_memories_fast(text_list, show_progress=show_progress)
+    
+    def bulk_store_memories_fast(self,
+                                 text_list: List[str],
+                                 metadatas: Optional[List[Optional[Dict]]] = None,
+                                 batch_size: int = 1000,
+                                 show_progress: bool = False) -> Dict:
+        """
+        Store multiple memories with one database commit per batch
+        
+        Args:
+            text_list: List of text strings to store
+            metadatas: Optional metadata dictionary per text
+            batch_size: Memories written per transaction
+            show_progress: Report progress after each committed batch
+            
+        Returns:
+            Dict: Bulk storage results and statistics
+        """
+        # Queued async writes go first: keeps ID order and a single writer
+        self.flush()
+        return self._bulk_store_memories_fast(text_list, metadatas, batch_size, show_progress)
+    
+    def _bulk_store_memories_fast(self, text_list: List[str], metadatas: Optional[List[Optional[Dict]]],
+                                  batch_size: int, show_progress: bool) -> Dict:
+        """Bulk store; callers guarantee no queued write is still pending"""
+        timestamp = time.time()
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             successful_stores = 0
             failed_stores = 0
             memory_ids = []
             
-            for i, text in enumerate(text_list):
-                if show_progress and i % 10 == 0:
-                    print(f"Storing memory {i+1}/{len(text_list)}...")
+            for batch_start in range(0, len(text_list), batch_size):
+                batch = text_list[batch_start:batch_start + batch_size]
+                batch_metadatas = metadatas[batch_start:batch_start + batch_size] if metadatas else None
+                
+                for memory_id in self._ltm.store_memories_batch(batch, batch_metadatas, batch_size):
+                    if memory_id is not None:
+                        successful_stores += 1
+                        memory_ids.append(memory_id)
+                    else:
+                        failed_stores += 1
+                
+                self._stats_cache = None  # Next statistics call sees this batch
                 
-                memory_id = self._ltm.store_memory(text)
-                if memory_id is not None:
-                    successful_stores += 1
-                    memory_ids.append(memory_id)
-                else:
-                    failed_stores += 1
+                if show_progress:
+                    print(f"Stored {batch_start + len(batch)}/{len(text_list)} memories...")
             
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             
             return {
                 "success": True,
@@ -249,17 +380,106 @@ class LongTermMemory_API:
                 "failed_stores": failed_stores,
                 "memory_ids": memory_ids,
                 "duration_seconds": duration,
-                "average_time_per_memory": duration / len(text_list),
-                "timestamp": time.time()
+                "average_time_per_memory": duration / len(text_list) if text_list else 0.0,
+                "timestamp": timestamp
             }
             
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
-                "timestamp": time.time()
+                "timestamp": timestamp
             }
     
+    def bulk_store_memories_async(self,
+                                  text_list: List[str],
+                                  metadatas: Optional[List[Optional[Dict]]] = None,
+                                  batch_size: int = 1000) -> Future:
+        """
+        Queue a bulk store on the background writer thread and return at once
+        
+        Args:
+            text_list: List of text strings to store
+            metadatas: Optional metadata dictionary per text
+            batch_size: Memories written per transaction
+            
+        Returns:
+            Future: Resolves to the bulk_store_memories_fast result dict
+        """
+        return self._submit_write(self._bulk_store_memories_fast, text_list, metadatas, batch_size, False)
+    
+    def store_memory_async(self,
+                           text: str,
+                           metadata: Optional[Dict] = None,
+                           dedupe: bool = False) -> Future:
+        """
+        Queue a single store on the background writer thread and return at once
+        
+        Args:
+            text: Text content to store
+            metadata: Optional metadata dictionary
+            dedupe: Return the existing memory instead of storing an exact duplicate
+                (default False; see store_memory)
+            
+        Returns:
+            Future: Resolves to the store_memory result dict
+        """
+        return self._submit_write(self._store_memory, text, metadata, dedupe)
+    
+    def search_similar_async(self,
+                             query_text: str,
+                             max_results: int = 10,
+                             radius: float = 0.5) -> Future:
+        """
+        Run search_similar on the reader pool and return at once
+        
+        Args:
+            query_text: Text to search for
+            max_results: Maximum number of results to return
+            radius: Search radius in 9D coordinate space
+            
+        Returns:
+            Future: Resolves to the search_similar result dict
+        """
+        if self._read_executor is None:
+            self._read_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                     thread_name_prefix="ltm-reader")
+        return self._read_executor.submit(self._search_on_reader, query_text, max_results, radius)
+    
+    def _search_on_reader(self, query_text: str, max_results: int, radius: float) -> Dict:
+        """search_similar on a pool thread; its LMDB snapshot is dropped when the task ends"""
+        with self._ltm.db_manager.read_scope():
+            return self.search_similar(query_text, max_results, radius)
+    
+    def _submit_write(self, fn, *args) -> Future:
+        """Queue a write on the single writer thread (commits in submission order)"""
+        if self._write_executor is None:
+            self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ltm-writer")
+        
+        # Drop finished futures so fire-and-forget callers don't accumulate results
+        self._pending_writes = [pending for pending in self._pending_writes if not pending.done()]
+        future = self._write_executor.submit(fn, *args)
+        self._pending_writes.append(future)
+        return future
+    
+    def flush(self) -> Dict:
+        """
+        Wait until every queued background write has been committed
+        
+        Returns:
+            Dict: Flush status
+        """
+        timestamp = time.time()
+        pending, self._pending_writes = self._pending_writes, []
+        for future in pending:
+            future.result()  # queued writes report errors in their result dicts
+        
+        return {
+            "success": True,
+            "flushed_batches": len(pending),
+            "timestamp": timestamp
+        }
+    
     def cleanup(self) -> Dict:
         """
         Clean up resources and close database connections
@@ -267,18 +487,26 @@ class LongTermMemory_API:
         Returns:
             Dict: Cleanup status
         """
+        timestamp = time.time()
         try:
+            self.flush()
+            if self._write_executor is not None:
+                self._write_executor.shutdown()
+                self._write_executor = None
+            if self._read_executor is not None:
+                self._read_executor.shutdown()
+                self._read_executor = None
             self._ltm.cleanup()
             return {
                 "success": True,
                 "message": "LTM API cleaned up successfully",
-                "timestamp": time.time()
+                "timestamp": timestamp
             }
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
-                "timestamp": time.time()
+                "timestamp": timestamp
             }
 
 def create_ltm_api(db_path: str = "LTM_CoreData.lmdb",
@@ -13,9 +13,77 @@ FOCUS: Fast, functional semantic relationship building!
 """
 
 import math
+import os
 import time
+import numpy as np
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from SpatialKernels import AXES, radial_scan, radial_top_k, top_k_order
+
+try:
+    from scipy.spatial import cKDTree
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+# Semantic dimension behind each coordinate axis (AXES order)
+DIM_NAMES = ('time', 'emotion', 'person', 'concrete', 'action',
+             'urgency', 'certainty', 'scope', 'focus')
+
+# Coordinate dict -> tuple of its 9 values in AXES order, in one C call
+_axis_values = itemgetter(*AXES)
+
+# Preallocated coordinate matrix rows (capacity doubles when full)
+COORD_INITIAL_ROWS = 1024
+
+# KD-tree over the coordinate matrix (scipy): only worth it for large sets.
+# Rows added since the last build are swept linearly until they exceed 1%.
+KDTREE_MIN_ROWS = 4096
+KDTREE_REBUILD_FRACTION = 0.01
+
+# Link edges are stored column-wise; the type column holds these codes
+LINK_TYPES = ('succession', 'radial')
+LINK_TYPE_CODES = {link_type: code for code, link_type in enumerate(LINK_TYPES)}
+EDGE_DTYPES = {
+    'src': np.int64,
+    'tgt': np.int64,
+    'type': np.uint8,
+    'strength': np.float32,
+    'dist': np.float32,
+    'order_diff': np.int64
+}
+
+class Memory:
+    """
+    🧩 In-memory record of one linked memory
+    
+    Slotted so the per-memory objects stay small (coordinates are also
+    packed into the linker's matrix); flattened to a plain dict (to_dict)
+    only when handed out by the query API.
+    """
+    __slots__ = ('id', 'coordinates', 'content', 'metadata', 'timestamp', 'order')
+    
+    def __init__(self, memory_id: int, coordinates: Dict[str, float], content: str,
+                 metadata: Dict, timestamp: float, order: int):
+        self.id = memory_id
+        self.coordinates = coordinates
+        self.content = content
+        self.metadata = metadata
+        self.timestamp = timestamp
+        self.order = order  # Order of addition (= coordinate matrix row)
+    
+    def to_dict(self) -> Dict:
+        """Flatten to the memory dictionary format returned by the query API"""
+        return {
+            'id': self.id,
+            'coordinates': self.coordinates,
+            'content': self.content,
+            'metadata': self.metadata,
+            'timestamp': self.timestamp,
+            'order': self.order
+        }
 
 class SemanticLinking_Manager_V2:
     """
@@ -42,7 +110,22 @@ class SemanticLinking_Manager_V2:
         
         # Memory tracking
         self.memories = []
-        self.links = {}  # memory_id -> list of links
+        self._id_to_idx = {}  # memory_id -> index into self.memories
+        
+        # Links as parallel edge columns, one row per (bidirectional) link,
+        # appended as Python lists and compacted into NumPy arrays when queried
+        self._edges = {name: [] for name in EDGE_DTYPES}
+        self._edge_rows = {}  # memory_id -> rows of the links touching it, in creation order
+        self._edge_arrays_cache = None
+        
+        # Coordinates of self.memories as one contiguous (N, 9) float32 matrix
+        # (AXES order, row i = memories[i]) so distance sweeps are single
+        # NumPy calls reading half the bytes of float64; kernels accumulate
+        # in float64 and results become Python floats at the API boundary
+        self._coord_matrix = np.empty((COORD_INITIAL_ROWS, 9), dtype=np.float32)
+        self._n = 0
+        self._tree = None  # KD-tree over the first _tree_n rows (see _spatial_tree)
+        self._tree_n = 0
         
         # Statistics
         self.stats = {
@@ -73,41 +156,188 @@ class SemanticLinking_Manager_V2:
         Returns:
             Dict: Link creation results
         """
-        
-        # Store memory
-        memory_entry = {
-            'id': memory_id,
+        return self.add_memories_bulk([{
+            'memory_id': memory_id,
             'coordinates': coordinates,
             'content': content,
-            'metadata': metadata or {},
-            'timestamp': time.time(),
-            'order': len(self.memories)  # Order of addition
-        }
+            'metadata': metadata
+        }])[0]
+    
+    def add_memories_bulk(self, items: List[Dict]) -> List[Dict]:
+        """
+        Add many memories at once and create their semantic links
         
-        self.memories.append(memory_entry)
-        self.links[memory_id] = []
-        self.stats['total_memories'] += 1
+        Produces exactly the links of calling add_memory for each item in
+        order, but the coordinates are appended as one block and the
+        succession distances of the whole batch come from one vectorized
+        pass per window offset.
         
-        # Create links
-        link_results = self._create_links_for_memory(memory_entry)
+        Args:
+            items: Dicts with add_memory's arguments ('memory_id',
+                'coordinates', 'content' and optionally 'metadata')
+            
+        Returns:
+            List[Dict]: Link creation results per item, in input order
+        """
+        first_row = len(self.memories)
+        timestamp = time.time()
+        
+        # Store memories
+        new_memories = []
+        for order, item in enumerate(items, start=first_row):
+            memory_id = item['memory_id']
+            memory_entry = Memory(memory_id, item['coordinates'], item['content'],
+                                  item.get('metadata') or {}, timestamp, order)
+            self._id_to_idx[memory_id] = order
+            self.memories.append(memory_entry)
+            self._edge_rows[memory_id] = []
+            new_memories.append(memory_entry)
+        
+        self._append_coordinates([item['coordinates'] for item in items])
+        self.stats['total_memories'] += len(new_memories)
+        succession_distances = self._succession_distances(first_row, self._n)
+        
+        # Create links, memory by memory so each one only sees earlier memories
+        all_results = []
+        for new_memory, window_distances in zip(new_memories, succession_distances):
+            link_results = self._create_links_for_memory(new_memory, window_distances)
+            all_results.append(link_results)
+            
+            if self.verbose:
+                total_links = link_results['succession_links'] + link_results['radial_links']
+                print(f"🔗 Memory {new_memory.id}: {total_links} links created "
+                      f"({link_results['succession_links']} succession + {link_results['radial_links']} radial)")
         
         # Update statistics
         self._update_stats()
         
-        if self.verbose:
-            total_links = link_results['succession_links'] + link_results['radial_links']
-            print(f"🔗 Memory {memory_id}: {total_links} links created "
-                  f"({link_results['succession_links']} succession + {link_results['radial_links']} radial)")
+        return all_results
+    
+    def _append_coordinates(self, coordinate_dicts: List[Dict[str, float]]):
+        """Write memories' coordinates into the next matrix rows"""
+        stop = self._n + len(coordinate_dicts)
+        if stop > len(self._coord_matrix):
+            # Amortized growth: double the preallocated capacity
+            capacity = len(self._coord_matrix)
+            while capacity < stop:
+                capacity *= 2
+            grown = np.empty((capacity, 9), dtype=self._coord_matrix.dtype)
+            grown[:self._n] = self._coord_matrix[:self._n]
+            self._coord_matrix = grown
+        if coordinate_dicts:
+            self._coord_matrix[self._n:stop] = [_axis_values(coordinates) for coordinates in coordinate_dicts]
+        self._n = stop
+    
+    def _succession_distances(self, first_row: int, stop: int) -> np.ndarray:
+        """
+        Distances from rows first_row..stop-1 to the rows just before them
         
-        return link_results
+        Column back-1 holds the distance to the row `back` places earlier
+        (0 where no such row exists), one vectorized pass per offset.
+        """
+        distances = np.zeros((stop - first_row, self.succession_window))
+        for back in range(1, self.succession_window + 1):
+            start = max(first_row, back)  # First row with a row `back` places earlier
+            if start >= stop:
+                continue
+            diffs = self._coord_matrix[start:stop] - self._coord_matrix[start - back:stop - back]
+            distances[start - first_row:, back - 1] = np.sqrt(np.einsum('ij,ij->i', diffs, diffs))
+        return distances
+    
+    def _spatial_tree(self, stop: int):
+        """
+        KD-tree over a prefix of the coordinate matrix, or None to sweep linearly
+        
+        Rows are append-only, so a tree stays valid as memories are added;
+        it is rebuilt once more than KDTREE_REBUILD_FRACTION of the rows
+        are newer than it.
+        """
+        if not HAS_SCIPY or stop < KDTREE_MIN_ROWS:
+            return None
+        if self._tree is None or stop - self._tree_n > self._tree_n * KDTREE_REBUILD_FRACTION:
+            self._tree = cKDTree(self._coord_matrix[:stop], leafsize=32)
+            self._tree_n = stop
+        return self._tree
     
-    def _create_links_for_memory(self, new_memory: Dict) -> Dict:
-        """Create links for a new memory"""
+    def _tree_candidates(self, query_vec: np.ndarray, radius: float, stop: int) -> Optional[np.ndarray]:
+        """
+        Ascending candidate rows before `stop` for a radius query, or None to sweep all
+        
+        Slightly widened ball query plus every row added since the tree was
+        built; callers apply the exact squared-distance check.
+        """
+        tree = self._spatial_tree(stop)
+        if tree is None:
+            return None
+        candidates = np.asarray(tree.query_ball_point(query_vec, radius * (1 + 1e-9)), dtype=np.intp)
+        candidates.sort()
+        return np.concatenate((candidates, np.arange(self._tree_n, stop)))
+    
+    def _rows_within(self, query_vec: np.ndarray, radius: float, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows before `stop` within radius of query_vec (ascending), with squared distances"""
+        candidates = self._tree_candidates(query_vec, radius, stop)
+        if candidates is None:
+            return radial_scan(self._coord_matrix[:stop], query_vec, radius * radius)
+        hits, distances_sq = radial_scan(self._coord_matrix[candidates], query_vec, radius * radius)
+        return candidates[hits], distances_sq
+    
+    def _nearest_within(self, query_vec: np.ndarray, radius: float, stop: int,
+                        k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Up to k rows before `stop` within radius of query_vec, nearest first, with squared distances"""
+        candidates = self._tree_candidates(query_vec, radius, stop)
+        if candidates is None:
+            return radial_top_k(self._coord_matrix[:stop], query_vec, radius * radius, k)
+        hits, distances_sq = radial_top_k(self._coord_matrix[candidates], query_vec, radius * radius, k)
+        return candidates[hits], distances_sq
+    
+    def _add_edge(self, src: int, tgt: int, link_type: str, strength: float, distance: float,
+                  order_diff: int = 0):
+        """Append one link row to the edge columns, listed under both endpoints"""
+        edges = self._edges
+        row = len(edges['src'])
+        self._edge_rows[src].append(row)
+        self._edge_rows[tgt].append(row)
+        edges['src'].append(src)
+        edges['tgt'].append(tgt)
+        edges['type'].append(LINK_TYPE_CODES[link_type])
+        edges['strength'].append(strength)
+        edges['dist'].append(distance)
+        edges['order_diff'].append(order_diff)
+    
+    def _edge_arrays(self) -> Dict[str, np.ndarray]:
+        """Edge columns as NumPy arrays (recompacted only after new edges)"""
+        cache = self._edge_arrays_cache
+        if cache is None or len(cache['src']) != len(self._edges['src']):
+            cache = self._edge_arrays_cache = {
+                name: np.asarray(column, dtype=EDGE_DTYPES[name])
+                for name, column in self._edges.items()
+            }
+        return cache
+    
+    def _link_dict(self, row: int, edges: Dict[str, np.ndarray], memory_id: int) -> Dict:
+        """Expand one edge row into the link dictionary seen from memory_id's end"""
+        src = int(edges['src'][row])
+        link = {
+            'target_id': int(edges['tgt'][row]) if src == memory_id else src,
+            'type': LINK_TYPES[edges['type'][row]],
+            'strength': float(edges['strength'][row]),
+            'distance': float(edges['dist'][row])
+        }
+        if link['type'] == 'succession':
+            link['order_difference'] = int(edges['order_diff'][row])
+        else:
+            # Computed on read: most radial links are never inspected
+            link['spatial_similarity'] = self._analyze_coordinate_similarity(
+                memory_id, link['target_id'])
+        return link
+    
+    def _create_links_for_memory(self, new_memory: Memory, window_distances: np.ndarray) -> Dict:
+        """Create links for a new memory (window_distances: see _succession_distances)"""
         succession_links = 0
         radial_links = 0
         
         # 1. LINEAR SUCCESSION LINKING
-        succession_links = self._create_succession_links(new_memory)
+        succession_links = self._create_succession_links(new_memory, window_distances)
         
         # 2. RADIAL COORDINATE SEARCH
         radial_links = self._create_radial_links(new_memory)
@@ -118,145 +348,95 @@ class SemanticLinking_Manager_V2:
             'total_links': succession_links + radial_links
         }
     
-    def _create_succession_links(self, new_memory: Dict) -> int:
+    def _create_succession_links(self, new_memory: Memory, window_distances: np.ndarray) -> int:
         """Create links to recent previous memories (linear succession)"""
         links_created = 0
-        memory_id = new_memory['id']
+        memory_id = new_memory.id
         
-        # Get recent memories (within succession window)
-        recent_memories = self.memories[-(self.succession_window + 1):-1]  # Exclude new memory itself
+        # Get recent memories (within succession window, before the new memory)
+        new_row = new_memory.order
+        recent_memories = self.memories[max(new_row - self.succession_window, 0):new_row]
         
         for recent_memory in recent_memories:
             # Calculate succession strength (more recent = stronger)
-            order_diff = new_memory['order'] - recent_memory['order']
+            order_diff = new_memory.order - recent_memory.order
             succession_strength = 1.0 - (order_diff / self.succession_window)
+            distance = float(window_distances[order_diff - 1])
             
-            # Create bidirectional succession link
-            succession_link = {
-                'target_id': recent_memory['id'],
-                'type': 'succession',
-                'strength': succession_strength,
-                'distance': self._calculate_coordinate_distance(
-                    new_memory['coordinates'], 
-                    recent_memory['coordinates']
-                ),
-                'order_difference': order_diff
-            }
-            
-            # Add forward link
-            self.links[memory_id].append(succession_link)
-            
-            # Add backward link
-            backward_link = succession_link.copy()
-            backward_link['target_id'] = memory_id
-            self.links[recent_memory['id']].append(backward_link)
+            # Create bidirectional succession link (one row, both endpoints)
+            self._add_edge(memory_id, recent_memory.id, 'succession', succession_strength, distance,
+                           order_diff=order_diff)
             
             links_created += 1
             self.stats['succession_links'] += 1
         
         return links_created
     
-    def _create_radial_links(self, new_memory: Dict) -> int:
+    def _create_radial_links(self, new_memory: Memory) -> int:
         """Create links to spatially nearby memories (radial search)"""
         links_created = 0
-        memory_id = new_memory['id']
+        memory_id = new_memory.id
         
-        # Find candidates within radial threshold
-        radial_candidates = []
+        # Targets this memory already links to (its succession rows so far),
+        # as a set: O(1) membership for each candidate below
+        edge_targets = self._edges['tgt']
+        linked_targets = {edge_targets[edge_row] for edge_row in self._edge_rows[memory_id]}  # new memory is src
         
-        for existing_memory in self.memories[:-1]:  # Exclude new memory
-            distance = self._calculate_coordinate_distance(
-                new_memory['coordinates'],
-                existing_memory['coordinates']
-            )
+        # Nearest earlier memories within the radial threshold (rows before
+        # the new memory's). Compiled bounded top-k scan: enough extra rows
+        # to cover succession targets skipped below, no sqrt per memory.
+        radial_candidates = []
+        new_row = new_memory.order
+        rows, distances_sq = self._nearest_within(self._coord_matrix[new_row], self.radial_threshold, new_row,
+                                                  self.max_radial_links + len(linked_targets))
+        
+        for row, distance_sq in zip(rows, distances_sq):
+            if len(radial_candidates) == self.max_radial_links:
+                break  # Only actual links get a sqrt
+            existing_memory = self.memories[row]
             
-            if distance <= self.radial_threshold:
-                # Check if not already linked via succession
-                already_linked = any(
-                    link['target_id'] == existing_memory['id'] 
-                    for link in self.links[memory_id]
-                )
-                
-                if not already_linked:
-                    radial_strength = 1.0 - (distance / self.radial_threshold)
-                    radial_candidates.append({
-                        'memory': existing_memory,
-                        'distance': distance,
-                        'strength': radial_strength
-                    })
-        
-        # Sort by strength and select top candidates
-        radial_candidates.sort(key=lambda x: x['strength'], reverse=True)
-        selected_candidates = radial_candidates[:self.max_radial_links]
-        
-        # Create radial links
-        for candidate in selected_candidates:
-            target_memory = candidate['memory']
+            # Check if not already linked via succession
+            already_linked = existing_memory.id in linked_targets
             
-            radial_link = {
-                'target_id': target_memory['id'],
-                'type': 'radial',
-                'strength': candidate['strength'],
-                'distance': candidate['distance'],
-                'spatial_similarity': self._analyze_coordinate_similarity(
-                    new_memory['coordinates'],
-                    target_memory['coordinates']
-                )
-            }
-            
-            # Add forward link
-            self.links[memory_id].append(radial_link)
+            if not already_linked:
+                distance = math.sqrt(distance_sq)
+                radial_strength = 1.0 - (distance / self.radial_threshold)
+                radial_candidates.append({
+                    'memory': existing_memory,
+                    'distance': distance,
+                    'strength': radial_strength
+                })
+        
+        # Create radial links (nearest first is strongest first)
+        for candidate in radial_candidates:
+            target_memory = candidate['memory']
             
-            # Add backward link
-            backward_link = radial_link.copy()
-            backward_link['target_id'] = memory_id
-            self.links[target_memory['id']].append(backward_link)
+            # Create bidirectional radial link (one row, both endpoints)
+            self._add_edge(memory_id, target_memory.id, 'radial', candidate['strength'], candidate['distance'])
             
             links_created += 1
             self.stats['radial_links'] += 1
         
         return links_created
     
-    def _calculate_coordinate_distance(self, coords1: Dict[str, float], 
-                                     coords2: Dict[str, float]) -> float:
-        """Calculate 9D Euclidean distance between coordinates"""
-        coord_names = ['x', 'y', 'z', 'a', 'b', 'c', 'd', 'e', 'f']
-        
-        distance_squared = sum(
-            (coords1[name] - coords2[name]) ** 2 
-            for name in coord_names
-        )
-        
-        return math.sqrt(distance_squared)
-    
-    def _analyze_coordinate_similarity(self, coords1: Dict[str, float], 
-                                     coords2: Dict[str, float]) -> Dict[str, float]:
-        """Analyze which dimensions are most similar"""
-        coord_names = ['x', 'y', 'z', 'a', 'b', 'c', 'd', 'e', 'f']
-        dimension_names = [
-            'time', 'emotion', 'person', 'concrete', 'action',
-            'urgency', 'certainty', 'scope', 'focus'
-        ]
-        
-        similarities = {}
-        
-        for coord_name, dim_name in zip(coord_names, dimension_names):
-            diff = abs(coords1[coord_name] - coords2[coord_name])
-            similarity = 1.0 - (diff / 2.0)  # Normalize to 0-1
-            similarities[dim_name] = similarity
-        
-        return similarities
+    def _analyze_coordinate_similarity(self, memory_id1: int, memory_id2: int) -> Dict[str, float]:
+        """Analyze which dimensions of two stored memories are most similar"""
+        # One vectorized pass over the two coordinate rows (AXES order)
+        diffs = np.abs(self._coord_matrix[self._id_to_idx[memory_id1]] -
+                       self._coord_matrix[self._id_to_idx[memory_id2]])
+        similarities = 1.0 - (diffs / 2.0)  # Normalize to 0-1
+        
+        return dict(zip(DIM_NAMES, similarities.tolist()))
     
     def get_memory_links(self, memory_id: int) -> List[Dict]:
         """Get all links for a specific memory"""
-        return self.links.get(memory_id, [])
+        edges = self._edge_arrays()
+        return [self._link_dict(row, edges, memory_id) for row in self._edge_rows.get(memory_id, [])]
     
     def get_memory_by_id(self, memory_id: int) -> Optional[Dict]:
         """Get memory data by ID"""
-        for memory in self.memories:
-            if memory['id'] == memory_id:
-                return memory
-        return None
+        idx = self._id_to_idx.get(memory_id)
+        return self.memories[idx].to_dict() if idx is not None else None
     
     def find_linked_memories(self, memory_id: int, link_type: Optional[str] = None,
                            min_strength: float = 0.0) -> List[Dict]:
@@ -272,25 +452,26 @@ class SemanticLinking_Manager_V2:
             List of linked memory data with link info
         """
         
-        if memory_id not in self.links:
+        if memory_id not in self._edge_rows:
             return []
         
-        linked_memories = []
+        # Filter this memory's edge rows with one vectorized mask
+        edges = self._edge_arrays()
+        rows = np.asarray(self._edge_rows[memory_id], dtype=np.intp)
+        mask = edges['strength'][rows] >= min_strength
+        if link_type:
+            mask &= edges['type'][rows] == LINK_TYPE_CODES.get(link_type, -1)
+        rows = rows[mask]
         
-        for link in self.links[memory_id]:
-            # Apply filters
-            if link_type and link['type'] != link_type:
-                continue
-            
-            if link['strength'] < min_strength:
-                continue
+        # Sort by link strength (stable: ties keep creation order)
+        rows = rows[np.argsort(-edges['strength'][rows], kind='stable')]
+        
+        linked_memories = []
+        for row in rows:
+            link = self._link_dict(row, edges, memory_id)
             
             # Find the target memory
-            target_memory = None
-            for memory in self.memories:
-                if memory['id'] == link['target_id']:
-                    target_memory = memory
-                    break
+            target_memory = self.get_memory_by_id(link['target_id'])
             
             if target_memory:
                 linked_memories.append({
@@ -298,9 +479,6 @@ class SemanticLinking_Manager_V2:
                     'link': link
                 })
         
-        # Sort by link strength
-        linked_memories.sort(key=lambda x: x['link']['strength'], reverse=True)
-        
         return linked_memories
     
     def find_spatial_neighborhood(self, coordinates: Dict[str, float], 
@@ -319,20 +497,50 @@ class SemanticLinking_Manager_V2:
         
         nearby_memories = []
         
-        for memory in self.memories:
-            distance = self._calculate_coordinate_distance(coordinates, memory['coordinates'])
+        query_vec = np.array(_axis_values(coordinates), dtype=self._coord_matrix.dtype)
+        rows, distances_sq = self._rows_within(query_vec, radius, self._n)
+        
+        # Closest max_results by squared distance (partition, then sort only
+        # those); sqrt only what is returned
+        order = top_k_order(distances_sq, max_results)
+        for row, distance in zip(rows[order], np.sqrt(distances_sq[order]).tolist()):
+            nearby_memories.append({
+                'memory': self.memories[row].to_dict(),
+                'distance': distance,
+                'similarity': 1.0 - (distance / radius)
+            })
+        
+        return nearby_memories
+    
+    def query_many(self, coordinates_list: List[Dict[str, float]], radius: float = 0.8,
+                   max_results: int = 10, max_workers: Optional[int] = None) -> List[List[Dict]]:
+        """
+        Run find_spatial_neighborhood for many centres across a thread pool
+        
+        The distance sweeps release the GIL, so the queries overlap on
+        multi-core machines. Do not add memories while this runs.
+        
+        Args:
+            coordinates_list: Center coordinates, one search per entry
+            radius: Search radius
+            max_results: Maximum number of results per search
+            max_workers: Thread count (defaults to the CPU count)
             
-            if distance <= radius:
-                nearby_memories.append({
-                    'memory': memory,
-                    'distance': distance,
-                    'similarity': 1.0 - (distance / radius)
-                })
+        Returns:
+            One neighbourhood result list per entry, in input order
+        """
+        
+        if len(coordinates_list) < 2:
+            return [self.find_spatial_neighborhood(coordinates, radius, max_results)
+                    for coordinates in coordinates_list]
         
-        # Sort by distance (closest first)
-        nearby_memories.sort(key=lambda x: x['distance'])
+        # Build any stale KD-tree once up front rather than racing in the workers
+        self._spatial_tree(self._n)
         
-        return nearby_memories[:max_results]
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as pool:
+            return list(pool.map(
+                lambda coordinates: self.find_spatial_neighborhood(coordinates, radius, max_results),
+                coordinates_list))
     
     def _update_stats(self):
         """Update linking statistics"""
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+⚡ SPATIAL KERNELS - COMPILED 9D DISTANCE MATH ⚡
+
+Hot numeric kernels shared by the memory managers.
+
+🎯 CORE FEATURES 🎯
+- Coordinate dicts → contiguous float32 (9,) vectors / (N, 9) matrices, converted once
+- Squared-distance sweeps over (N, 9) coordinate matrices (float32 or int16),
+  one query at a time or a (Q, N) block for a batch of queries
+- Radius scans returning matching rows and their squared distances
+  (fused single-pass radial_scan for float64 / mixed-precision callers)
+- Bounded top-k radius scans (radial_top_k) for link selection
+- Numba @njit compilation when numba is installed (multi-core sweeps over
+  large matrices), SimSIMD matrix sweeps without numba, NumPy fallback otherwise
+- Compiled kernels release the GIL, so concurrent queries from threads overlap
+- warm_up() compiles every kernel into numba's on-disk cache ahead of the
+  first query (run `python SpatialKernels.py` once after installing)
+"""
+
+import math
+import numpy as np
+from typing import Dict
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import simsimd
+    HAS_SIMSIMD = True
+except ImportError:
+    HAS_SIMSIMD = False
+
+# Canonical axis order for every 9D vector in the system
+AXES = ('x', 'y', 'z', 'a', 'b', 'c', 'd', 'e', 'f')
+
+# Below this many rows, thread dispatch costs more than the sweep itself
+PARALLEL_MIN_ROWS = 65536
+
+def coords_to_vec(coordinates) -> np.ndarray:
+    """Convert a 9D coordinate dictionary (or array) into a float32 (9,) vector"""
+    if isinstance(coordinates, np.ndarray):
+        return coordinates.astype(np.float32, copy=False)
+    return np.fromiter((coordinates.get(axis, 0.0) for axis in AXES),
+                       dtype=np.float32, count=9)
+
+def coords_to_matrix(coordinate_dicts) -> np.ndarray:
+    """Stack 9D coordinate dictionaries into a contiguous float32 (N, 9) matrix"""
+    rows = [[coordinates.get(axis, 0.0) for axis in AXES] for coordinates in coordinate_dicts]
+    return np.array(rows, dtype=np.float32).reshape(-1, 9)
+
+def vec_to_coords(vec) -> Dict[str, float]:
+    """Convert a (9,) vector back into the coordinate dictionary used at API boundaries"""
+    return {axis: float(value) for axis, value in zip(AXES, vec)}
+
+if HAS_NUMBA:
+    @njit(fastmath=True, cache=True, nogil=True)
+    def dist9_sq(a, b):
+        """Squared Euclidean distance between two float32 (9,) vectors"""
+        acc = np.float32(0.0)
+        for i in range(a.shape[0]):
+            diff = a[i] - b[i]
+            acc += diff * diff
+        return acc
+    
+    @njit(fastmath=True, cache=True, nogil=True)
+    def dist9(a, b):
+        """Euclidean distance between two float32 (9,) vectors"""
+        return math.sqrt(dist9_sq(a, b))
+
+    @njit(fastmath=True, cache=True, nogil=True)
+    def _squared_distances_serial(matrix, query):
+        n = matrix.shape[0]
+        out = np.empty(n, dtype=np.float32)
+        for row in range(n):
+            acc = np.float32(0.0)
+            for i in range(matrix.shape[1]):
+                diff = np.float32(matrix[row, i]) - query[i]
+                acc += diff * diff
+            out[row] = acc
+        return out
+    
+    @njit(fastmath=True, cache=True, nogil=True, parallel=True)
+    def _squared_distances_parallel(matrix, query):
+        n = matrix.shape[0]
+        out = np.empty(n, dtype=np.float32)
+        for row in prange(n):
+            acc = np.float32(0.0)
+            for i in range(matrix.shape[1]):
+                diff = np.float32(matrix[row, i]) - query[i]
+                acc += diff * diff
+            out[row] = acc
+        return out
+    
+    @njit(fastmath=True, cache=True, nogil=True)
+    def radial_scan(matrix, query, radius_sq):
+        """Rows of matrix within sqrt(radius_sq) of query and their squared distances, in one pass"""
+        n = matrix.shape[0]
+        rows = np.empty(n, dtype=np.intp)
+        distances_sq = np.empty(n, dtype=np.float64)
+        count = 0
+        for row in range(n):
+            acc = 0.0  # float64 accumulator whatever the matrix dtype
+            for i in range(matrix.shape[1]):
+                diff = matrix[row, i] - query[i]
+                acc += diff * diff
+            if acc <= radius_sq:  # squared compare: no sqrt per row
+                rows[count] = row
+                distances_sq[count] = acc
+                count += 1
+        return rows[:count], distances_sq[:count]
+    
+    @njit(fastmath=True, cache=True, nogil=True)
+    def radial_top_k(matrix, query, radius_sq, k):
+        """The k rows of matrix nearest query within sqrt(radius_sq), nearest first (ties: lower row)"""
+        best_rows = np.empty(max(k, 0), dtype=np.intp)
+        best_sq = np.empty(max(k, 0), dtype=np.float64)
+        count = 0
+        if k <= 0:
+            return best_rows, best_sq
+        for row in range(matrix.shape[0]):
+            acc = 0.0
+            for i in range(matrix.shape[1]):
+                diff = matrix[row, i] - query[i]
+                acc += diff * diff
+            if acc > radius_sq or (count == k and acc >= best_sq[k - 1]):
+                continue
+            # Insertion into the sorted top-k buffer (k is small)
+            if count < k:
+                count += 1
+            pos = count - 1
+            while pos > 0 and best_sq[pos - 1] > acc:
+                best_sq[pos] = best_sq[pos - 1]
+                best_rows[pos] = best_rows[pos - 1]
+                pos -= 1
+            best_sq[pos] = acc
+            best_rows[pos] = row
+        return best_rows[:count], best_sq[:count]
+    
+    @njit(fastmath=True, cache=True, nogil=True)
+    def _squared_distances_many(matrix, queries):
+        out = np.empty((queries.shape[0], matrix.shape[0]), dtype=np.float32)
+        for row in range(matrix.shape[0]):  # Each matrix row is read once for every query
+            for q in range(queries.shape[0]):
+                acc = np.float32(0.0)
+                for i in range(matrix.shape[1]):
+                    diff = np.float32(matrix[row, i]) - queries[q, i]
+                    acc += diff * diff
+                out[q, row] = acc
+        return out
+    
+    def squared_distances(matrix, query):
+        """Squared distances from float32 query (9,) to every row of matrix (N, 9)"""
+        if matrix.shape[0] >= PARALLEL_MIN_ROWS:
+            return _squared_distances_parallel(matrix, query)
+        return _squared_distances_serial(matrix, query)
+    
+    def squared_distances_many(matrix, queries):
+        """Squared distances from float32 queries (Q, 9) to every row of matrix (N, 9), as (Q, N)"""
+        return _squared_distances_many(matrix, queries)
+else:
+    def dist9_sq(a, b):
+        """Squared Euclidean distance between two float32 (9,) vectors"""
+        diff = a - b
+        return float(np.dot(diff, diff))
+    
+    def dist9(a, b):
+        """Euclidean distance between two float32 (9,) vectors"""
+        return math.sqrt(dist9_sq(a, b))
+
+    def squared_distances(matrix, query):
+        """Squared distances from float32 query (9,) to every row of matrix (N, 9)"""
+        if HAS_SIMSIMD and matrix.shape[0]:
+            # SIMD sweep over contiguous float32 rows (int16 rows promote here)
+            distances_sq = simsimd.cdist(query.reshape(1, -1), matrix.astype(np.float32, copy=False),
+                                         metric='sqeuclidean', out_dtype='float32')
+            return np.asarray(distances_sq)[0]
+        diffs = matrix - query  # int16 rows promote to float32 here
+        return np.einsum('ij,ij->i', diffs, diffs)
+    
+    def squared_distances_many(matrix, queries):
+        """Squared distances from float32 queries (Q, 9) to every row of matrix (N, 9), as (Q, N)"""
+        if HAS_SIMSIMD and matrix.shape[0] and queries.shape[0]:
+            distances_sq = simsimd.cdist(queries, matrix.astype(np.float32, copy=False),
+                                         metric='sqeuclidean', out_dtype='float32')
+            return np.asarray(distances_sq)
+        return np.stack([squared_distances(matrix, query) for query in queries]).reshape(len(queries), -1)
+    
+    def radial_scan(matrix, query, radius_sq):
+        """Rows of matrix within sqrt(radius_sq) of query and their squared distances, in one pass"""
+        diffs = matrix - query  # Keeps the caller's precision (no float32 SIMD path)
+        distances_sq = np.einsum('ij,ij->i', diffs, diffs)
+        rows = np.flatnonzero(distances_sq <= radius_sq)
+        return rows, distances_sq[rows]
+    
+    def radial_top_k(matrix, query, radius_sq, k):
+        """The k rows of matrix nearest query within sqrt(radius_sq), nearest first (ties: lower row)"""
+        rows, distances_sq = radial_scan(matrix, query, radius_sq)
+        order = top_k_order(distances_sq, k)
+        return rows[order], distances_sq[order]
+
+def top_k_order(distances_sq, k):
+    """
+    Indices of the k smallest distances, smallest first
+    
+    Selection is O(N) (partition, no full sort) and ties at the cut-off
+    keep the earliest indices, exactly as a stable sort-then-slice would.
+    """
+    if len(distances_sq) > k:
+        if k > 0:
+            cutoff = np.partition(distances_sq, k - 1)[k - 1]
+            closer = np.flatnonzero(distances_sq < cutoff)
+            tied = np.flatnonzero(distances_sq == cutoff)[:k - len(closer)]
+            keep = np.concatenate((closer, tied))
+        else:
+            keep = np.arange(0)
+        return keep[np.argsort(distances_sq[keep], kind='stable')]
+    return np.argsort(distances_sq, kind='stable')
+
+def scan_radius(matrix, query, radius_sq):
+    """Rows of matrix within sqrt(radius_sq) of query, with their squared distances"""
+    distances_sq = squared_distances(matrix, query)
+    rows = np.flatnonzero(distances_sq <= radius_sq)
+    return rows, distances_sq[rows]
+
+def warm_up():
+    """
+    Compile the numba kernels for the dtypes the managers use
+    
+    Kernels are cached on disk (cache=True), so after one warm-up later
+    processes load machine code instead of JIT-compiling on first query.
+    """
+    if not HAS_NUMBA:
+        return
+    query = np.zeros(9, dtype=np.float32)
+    for matrix in (np.zeros((1, 9), dtype=np.float32), np.zeros((1, 9), dtype=np.int16)):
+        _squared_distances_serial(matrix, query)
+        _squared_distances_parallel(matrix, query)
+        _squared_distances_many(matrix, query.reshape(1, 9))
+    matrix = np.zeros((1, 9), dtype=np.float32)
+    radial_scan(matrix, query, 1.0)
+    radial_top_k(matrix, query, 1.0, 1)
+    dist9(query, query)
+
+if __name__ == "__main__":
+    import time
+    start = time.time()
+    warm_up()
+    if HAS_NUMBA:
+        print(f"⚡ Spatial kernels compiled and cached in {time.time() - start:.2f}s")
+    else:
+        print("⚡ numba not installed - NumPy kernels need no compilation")
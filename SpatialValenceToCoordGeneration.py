@@ -269,6 +269,11 @@ class SpatialValenceToCoordGeneration:
             'processing_time': processing_time
         }
     
+    def process_batch(self, texts: List[str]) -> List[Dict]:
+        """Process a batch of texts (bulk entry point, one result per text)"""
+        process = self.process
+        return [process(text) for text in texts]
+    
     def generate_coordinate_key(self, coords: Dict[str, float]) -> str:
         """Generate [x.xxx][y.yyy][z.zzz]...[f.fff] key format"""
         key_parts = []
@@ -39,6 +39,10 @@ class UniversalSpatialProcessor:
             'avg_processing_time': 0.0,
             'avg_confidence': 0.0
         }
+        
+        # Running sums behind the averages (one add + one divide per item)
+        self._time_sum = 0.0
+        self._confidence_sum = 0.0
     
     def process_stm_message(self, user_input: str, ai_response: str = None) -> dict:
         """
@@ -188,14 +192,12 @@ class UniversalSpatialProcessor:
         total = self.stats['total_processed']
         
         # Running average of processing time
-        current_avg_time = self.stats['avg_processing_time']
-        new_time = result['processing_time']
-        self.stats['avg_processing_time'] = ((current_avg_time * (total - 1)) + new_time) / total
+        self._time_sum += result['processing_time']
+        self.stats['avg_processing_time'] = self._time_sum / total
         
         # Running average of confidence
-        current_avg_conf = self.stats['avg_confidence']
-        new_conf = result['confidence']
-        self.stats['avg_confidence'] = ((current_avg_conf * (total - 1)) + new_conf) / total
+        self._confidence_sum += result['confidence']
+        self.stats['avg_confidence'] = self._confidence_sum / total
     
     def get_performance_stats(self) -> dict:
         """Get comprehensive performance statistics"""
@@ -226,6 +228,9 @@ class UniversalSpatialProcessor:
    🔄 Consistency: {stats['consistency_level']}
         """
 
+# Shared processor behind the one-shot helper (built on first use)
+_shared_processor = None
+
 # Convenience factory functions
 def create_universal_processor():
     """Create a universal spatial processor with DEEP mode everywhere"""
@@ -237,8 +242,10 @@ def process_any_content(text: str, context: str = None, content_type: str = "gen
     
     Perfect for: "I just want to process this text with maximum semantic depth"
     """
-    processor = UniversalSpatialProcessor()
-    return processor.process_universal(text, context, content_type)
+    global _shared_processor
+    if _shared_processor is None:
+        _shared_processor = UniversalSpatialProcessor()
+    return _shared_processor.process_universal(text, context, content_type)
 
 # Quick test
 if __name__ == "__main__":
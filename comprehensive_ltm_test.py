@@ -17,7 +17,6 @@ This test validates:
 import sys
 import os
 import time
-import json
 from typing import List, Dict, Any
 
 # Add LTM directory to path
@@ -49,7 +48,7 @@ class LTMComprehensiveTest:
             self.ltm = EngramManager(
                 db_path=self.test_db_path,
                 enable_linking=True,  # Enable semantic linking
-                turbo_mode=False,     # Use SAFE mode for testing
+                turbo_mode=True,      # No per-commit fsync: the test DB is deleted in cleanup
                 verbose=True
             )
             print("✅ LTM system initialized successfully")
@@ -132,6 +131,26 @@ class LTMComprehensiveTest:
         test_data = self.generate_test_data()
         storage_start_time = time.time()
         
+        # Aligned lists over every category, stored in one batched call:
+        # one encode pass over all texts and one LMDB write transaction
+        all_texts = []
+        all_metadatas = []
+        for category, texts in test_data.items():
+            all_texts.extend(texts)
+            all_metadatas.extend({
+                'category': category,
+                'test_index': i,
+                'content_length': len(text)
+            } for i, text in enumerate(texts))
+        
+        try:
+            all_memory_ids = self.ltm.store_memories_batch(all_texts, all_metadatas)
+        except Exception as e:
+            all_memory_ids = [None] * len(all_texts)
+            print(f"  ❌ Error storing memories: {e}")
+            self.test_results['errors'].append(f"Storage error: {e}")
+        
+        offset = 0
         for category, texts in test_data.items():
             print(f"\nTesting {category} content...")
             category_results = {
@@ -142,40 +161,32 @@ class LTMComprehensiveTest:
                 'memory_ids': []
             }
             
-            for i, text in enumerate(texts):
-                try:
-                    metadata = {
+            metadatas = all_metadatas[offset:offset + len(texts)]
+            memory_ids = all_memory_ids[offset:offset + len(texts)]
+            offset += len(texts)
+            
+            for text, metadata, memory_id in zip(texts, metadatas, memory_ids):
+                if memory_id is not None:
+                    category_results['successful_stores'] += 1
+                    category_results['memory_ids'].append(memory_id)
+                    self.stored_memories.append({
+                        'id': memory_id,
+                        'text': text,
                         'category': category,
-                        'test_index': i,
-                        'content_length': len(text),
-                        'timestamp': time.time()
-                    }
-                    
-                    memory_id = self.ltm.store_memory(text, metadata)
-                    
-                    if memory_id is not None:
-                        category_results['successful_stores'] += 1
-                        category_results['memory_ids'].append(memory_id)
-                        self.stored_memories.append({
-                            'id': memory_id,
-                            'text': text,
-                            'category': category,
-                            'metadata': metadata
-                        })
-                        print(f"  ✅ Stored memory {memory_id}: {text[:50]}...")
-                    else:
-                        category_results['failed_stores'] += 1
-                        print(f"  ❌ Failed to store: {text[:50]}...")
-                        
-                except Exception as e:
+                        'metadata': metadata
+                    })
+                    print(f"  ✅ Stored memory {memory_id}: {text[:50]}...")
+                else:
                     category_results['failed_stores'] += 1
-                    print(f"  ❌ Error storing memory: {e}")
-                    self.test_results['errors'].append(f"Storage error in {category}: {e}")
+                    print(f"  ❌ Failed to store: {text[:50]}...")
             
             self.test_results['storage_tests'].append(category_results)
             success_rate = (category_results['successful_stores'] / category_results['total_items']) * 100
             print(f"  📊 {category}: {category_results['successful_stores']}/{category_results['total_items']} stored ({success_rate:.1f}%)")
         
+        # One sync at the end so the timing still covers a durable state
+        self.ltm.force_sync()
+        
         storage_duration = time.time() - storage_start_time
         print(f"\n⏱️ Total storage time: {storage_duration:.2f} seconds")
         print(f"📈 Average storage time: {storage_duration/len(self.stored_memories):.4f} seconds per memory")
@@ -226,6 +237,11 @@ class LTMComprehensiveTest:
         
         retrieval_start_time = time.time()
         
+        # Every query is scored in one batched search; the loop below only reports
+        all_queries = [query for queries in test_queries.values() for query in queries]
+        all_results = iter(self.ltm.search_similar_batch(all_queries, max_results=5))
+        search_duration = (time.time() - retrieval_start_time) / max(len(all_queries), 1)  # Amortized per query
+        
         for query_category, queries in test_queries.items():
             print(f"\nTesting {query_category}...")
             category_results = {
@@ -239,9 +255,7 @@ class LTMComprehensiveTest:
             
             for query in queries:
                 try:
-                    search_start = time.time()
-                    results = self.ltm.search_similar(query, max_results=5)
-                    search_duration = time.time() - search_start
+                    results = next(all_results)
                     
                     query_detail = {
                         'query': query,
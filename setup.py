@@ -32,7 +32,7 @@ def read_requirements():
     if os.path.exists(req_path):
         with open(req_path, 'r', encoding='utf-8') as f:
             return [line.strip() for line in f if line.strip() and not line.startswith('#')]
-    return ['numpy>=1.21.0', 'lmdb>=1.4.0', 'typing-extensions>=4.0.0']
+    return ['numpy>=1.21.0', 'lmdb>=1.4.0', 'msgpack>=1.0.0', 'typing-extensions>=4.0.0']
 
 setup(
     name="ltm-api",
@@ -71,6 +71,10 @@ setup(
         "performance": [
             "psutil>=5.8.0",
             "ujson>=5.0.0",
+            "numba>=0.56.0",
+            "simsimd>=3.0.0",
+            "orjson>=3.6.0",
+            "scipy>=1.6.0",
         ],
     },
     entry_points={
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+🗄️ STORAGE FORMAT QUICK TEST
+Legacy migration, CRC framing, crash recovery and the async writer
+"""
+
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import lmdb
+
+from EnhancedDBManager import COORD_KEY_SIZE, NON_MEMORY_KEYS, EnhancedDBManager
+from SpatialKernels import AXES
+
+def make_coords(i):
+    """Distinct, 3-decimal coordinates for memory i"""
+    return {axis: round(((i * 7 + n * 3) % 97) / 50.0 - 0.97, 3) for n, axis in enumerate(AXES)}
+
+def make_items(count):
+    """Memory dicts with fixed timestamps so two stores compare equal"""
+    return [{
+        'input': f"memory number {i}",
+        'semantic': f"summary {i}",
+        'coordinates': make_coords(i),
+        'timestamp': 1700000000.0 + i,
+        'metadata': {'index': i, 'source': 'storage_test'}
+    } for i in range(count)]
+
+def check_legacy_migration(work_dir):
+    print("\n🔄 Legacy pickle database → migrate → read back")
+    db_path = os.path.join(work_dir, "legacy.lmdb")
+    items = make_items(25)
+    
+    # Write the pre-packed-key format: JSON-list keys, pickled values and stats
+    env = lmdb.open(db_path, map_size=64 * 1024 * 1024)
+    with env.begin(write=True) as txn:
+        for memory_id, item in enumerate(items):
+            coord_key = json.dumps([item['coordinates'][axis] for axis in AXES]).encode()
+            txn.put(coord_key, pickle.dumps(dict(item, id=memory_id, input_text=item['input'],
+                                                 semantic_summary=item['semantic']), protocol=2))
+        txn.put(b'__stats__', pickle.dumps({'total_memories': len(items)}, protocol=2))
+    env.close()
+    
+    db = EnhancedDBManager(db_path, max_size=64 * 1024 * 1024)
+    before = [db.get_memory_by_id(memory_id) for memory_id in range(len(items))]
+    assert all(before), "legacy records should be readable by id"
+    print(f"   📖 Read {len(before)} legacy records")
+    
+    migrated = db.migrate_legacy_keys(batch_size=10)
+    assert migrated == len(items), f"expected {len(items)} migrated, got {migrated}"
+    after = [db.get_memory_by_id(memory_id) for memory_id in range(len(items))]
+    assert after == before, "migrated records should read back identically"
+    assert db.migrate_legacy_keys() == 0, "second migration should be a no-op"
+    
+    with db.env.begin() as txn:
+        for memory_id in range(len(items)):
+            record = db.get_memory_by_id(memory_id)
+            assert txn.get(db._create_coordinate_key(record['coordinates'])) is not None
+        memory_keys = [key for key in txn.cursor().iternext(keys=True, values=False) if key not in NON_MEMORY_KEYS]
+        assert all(len(key) == COORD_KEY_SIZE for key in memory_keys), "no legacy keys should remain"
+    db.close()
+    print(f"   ✅ Migrated {migrated} records, contents unchanged")
+
+def check_corrupted_record(work_dir):
+    print("\n🛡️ Corrupted CRC record is rejected")
+    db = EnhancedDBManager(os.path.join(work_dir, "crc.lmdb"), max_size=64 * 1024 * 1024)
+    memory_id = db.store_memory_engram(make_items(1)[0])
+    assert db.get_memory_by_id(memory_id) is not None
+    
+    coord_key = db._create_coordinate_key(make_coords(0))
+    with db.env.begin(write=True) as txn:
+        damaged = bytearray(txn.get(coord_key))
+        damaged[-1] ^= 0xFF
+        txn.put(coord_key, bytes(damaged))
+    db._invalidate_reads()
+    
+    assert db._decode_value(bytes(damaged)) is None, "damaged payload should fail its CRC"
+    assert db.get_memory_by_id(memory_id) is None, "damaged record should not be returned"
+    db.close()
+    print("   ✅ Flipped payload byte detected, record not returned")
+
+CRASH_WRITER = """
+import os, sys
+sys.path.insert(0, sys.argv[1])
+from EnhancedDBManager import EnhancedDBManager
+from test_storage_format import make_items
+db = EnhancedDBManager(sys.argv[2], max_size=64 * 1024 * 1024)
+db.store_many(make_items(int(sys.argv[3])))
+os._exit(0)  # No close(): stats are never written back
+"""
+
+def check_crash_recovery(work_dir):
+    print("\n💥 Reopen without close() recovers total_memories")
+    db_path = os.path.join(work_dir, "crash.lmdb")
+    count = 40
+    subprocess.run([sys.executable, "-c", CRASH_WRITER, os.path.dirname(os.path.abspath(__file__)),
+                    db_path, str(count)], check=True)
+    
+    db = EnhancedDBManager(db_path, max_size=64 * 1024 * 1024)
+    total = db.stats['total_memories']
+    assert total == count, f"expected {count} memories after recovery, got {total}"
+    assert db.store_memory_engram(make_items(count + 1)[count]) == count, "next id should follow recovered count"
+    db.close()
+    print(f"   ✅ Recovered {total} memories, next id {count}")
+
+def check_async_writes(work_dir):
+    print("\n⚡ Async writer matches synchronous writes")
+    items = make_items(300)
+    sync_db = EnhancedDBManager(os.path.join(work_dir, "sync.lmdb"), max_size=64 * 1024 * 1024)
+    async_db = EnhancedDBManager(os.path.join(work_dir, "async.lmdb"), max_size=64 * 1024 * 1024,
+                                 async_writes=True)
+    
+    sync_ids = [sync_db.store_memory_engram(item) for item in items[:50]] + sync_db.store_many(items[50:])
+    async_ids = [async_db.store_memory_engram(item) for item in items[:50]] + async_db.store_many(items[50:])
+    async_db.flush()
+    assert sync_ids == async_ids, "both writers should hand out the same ids"
+    
+    for memory_id in sync_ids:
+        assert sync_db.get_memory_by_id(memory_id) == async_db.get_memory_by_id(memory_id), \
+            f"memory {memory_id} differs"
+    assert sync_db.stats['total_memories'] == async_db.stats['total_memories']
+    sync_db.close()
+    async_db.close()
+    print(f"   ✅ {len(sync_ids)} memories identical across writers")
+
+def test_storage_format():
+    print("🗄️ Testing Storage Format")
+    print("=" * 40)
+    
+    work_dir = tempfile.mkdtemp(prefix="storage_test_")
+    try:
+        check_legacy_migration(work_dir)
+        check_corrupted_record(work_dir)
+        check_crash_recovery(work_dir)
+        check_async_writes(work_dir)
+    finally:
+        # Cleanup
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    print("\n✅ Storage format test successful!")
+
+if __name__ == "__main__":
+    test_storage_format()